@@ -103,14 +103,14 @@ def get_stats():
         leaderboard = db_manager.get_leaderboard(sort_by=sort_by)
         
         # Get series info
-        series_info = db_manager.data.get('series_info', {})
+        series_info = db_manager.get_series_info()
         
         return jsonify({
             "success": True,
             "series_info": series_info,
             "leaderboard": leaderboard,
             "total_players": len(leaderboard),
-            "last_updated": db_manager.data.get('last_updated')
+            "last_updated": db_manager.get_last_updated()
         })
     
     except Exception as e:
@@ -176,7 +176,7 @@ def get_events():
         # Return all events
         return jsonify({
             "success": True,
-            "events": db_manager.data.get('events', {})
+            "events": db_manager.get_all_events()
         })
     
     except Exception as e:
@@ -483,6 +483,7 @@ def scrape_event():
         data = request.get_json()
         event_url = data.get('event_url')
         event_name = data.get('event_name', 'AADS Event')
+        refresh = bool(data.get('refresh', False))
         
         if not event_url:
             return jsonify({
@@ -497,7 +498,7 @@ def scrape_event():
         from scraper_flask_integration import scrape_full_event_comprehensive_flask
         thread = threading.Thread(
             target=scrape_full_event_comprehensive_flask, 
-            args=(event_url, job_id)
+            args=(event_url, job_id, refresh)
         )
         thread.daemon = True
         thread.start()
@@ -133,7 +133,7 @@ def batch_scrape_event():
         print(f"{i:<6} {player['name']:<25} {player['weighted_3da']:<8.2f} "
               f"{player['events_played']:<8} {player['one_eighties']:<6}")
     
-    print("\n✅ Data saved to aads_master_db.json")
+    print("\n✅ Data saved to aads_master_db.sqlite")
     print(f"🌐 View dashboard at: http://localhost:5000")
 
 if __name__ == "__main__":
@@ -122,7 +122,7 @@ class TwoStageDartScraper:
             response.raise_for_status()
             
             # Parse HTML and extract JSON data from Inertia.js
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             app_div = soup.find('div', {'id': 'app'})
             
             if not app_div or 'data-page' not in app_div.attrs:
@@ -151,7 +151,7 @@ class TwoStageDartScraper:
             counts_response = self.session.get(counts_url, timeout=15)
             counts_response.raise_for_status()
             
-            counts_soup = BeautifulSoup(counts_response.text, 'html.parser')
+            counts_soup = BeautifulSoup(counts_response.content, 'lxml')
             counts_app_div = counts_soup.find('div', {'id': 'app'})
             
             if counts_app_div and 'data-page' in counts_app_div.attrs:
@@ -321,7 +321,7 @@ class TwoStageDartScraper:
             response = self.session.get(event_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             app_div = soup.find('div', {'id': 'app'})
             
             if app_div and 'data-page' in app_div.attrs:
@@ -5,77 +5,191 @@ Handles player statistics tracking across multiple events with weighted averages
 
 import json
 import os
-from typing import Dict, List, Optional
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 
+SERIES_INFO = {
+    "name": "Atlantic Amateur Darts Series",
+    "total_events": 7,
+    "qualifying_events": 6,
+    "championship_event": 7
+}
+
+# Columns get_leaderboard() may sort on (interpolated into ORDER BY, so whitelisted)
+SORTABLE_COLUMNS = {
+    "weighted_3da", "total_legs", "total_180s", "total_140s", "total_100s",
+    "highest_finish", "best_first_9", "name"
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    total_legs INTEGER NOT NULL DEFAULT 0,
+    total_dart_sum REAL NOT NULL DEFAULT 0,
+    weighted_3da REAL NOT NULL DEFAULT 0,
+    total_180s INTEGER NOT NULL DEFAULT 0,
+    total_140s INTEGER NOT NULL DEFAULT 0,
+    total_100s INTEGER NOT NULL DEFAULT 0,
+    qualified INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_players_weighted_3da ON players (weighted_3da DESC);
+
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY,
+    winner TEXT,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS event_participants (
+    event_id INTEGER NOT NULL,
+    player_name TEXT NOT NULL,
+    PRIMARY KEY (event_id, player_name)
+);
+CREATE INDEX IF NOT EXISTS idx_event_participants_player ON event_participants (player_name);
+
+CREATE TABLE IF NOT EXISTS event_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    three_dart_avg REAL NOT NULL,
+    legs_played INTEGER NOT NULL,
+    first_9_avg REAL NOT NULL,
+    one_eighties INTEGER NOT NULL,
+    one_forty_plus INTEGER NOT NULL,
+    hundreds_plus INTEGER NOT NULL,
+    high_finish INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_history_player ON event_history (player_name);
+
+-- highest_finish / best_first_9 are derived from event_history on read
+CREATE VIEW IF NOT EXISTS player_summary AS
+SELECT p.rowid AS seq, p.name, p.total_legs, p.weighted_3da,
+       p.total_180s, p.total_140s, p.total_100s,
+       COALESCE(h.highest_finish, 0) AS highest_finish,
+       COALESCE(h.best_first_9, 0.0) AS best_first_9,
+       p.qualified
+FROM players p
+LEFT JOIN (
+    SELECT player_name, MAX(high_finish) AS highest_finish, MAX(first_9_avg) AS best_first_9
+    FROM event_history GROUP BY player_name
+) h ON h.player_name = p.name;
+"""
+
+
 class AADSDataManager:
     """
     Manages the AADS Master Database for player statistics tracking.
-    
+
     Key Features:
     - Weighted average calculation for 3DA across all legs
     - Event-specific history tracking
     - Qualification status for Tournament of Champions
-    - Persistent JSON storage
+    - Persistent SQLite storage (indexed tables, incremental writes)
     """
-    
-    def __init__(self, db_path: str = "aads_master_db.json"):
+
+    def __init__(self, db_path: str = "aads_master_db.sqlite",
+                 legacy_json_path: str = "aads_master_db.json"):
         """
         Initialize the database manager.
-        
+
         Args:
-            db_path: Path to the JSON database file
+            db_path: Path to the SQLite database file
+            legacy_json_path: JSON database imported on first run, if present
         """
         self.db_path = db_path
-        self.data = self._load_database()
-    
-    def _load_database(self) -> Dict:
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        if self._is_empty() and legacy_json_path and os.path.exists(legacy_json_path):
+            self._import_legacy_json(legacy_json_path)
+
+    def _is_empty(self) -> bool:
+        """Check whether the database has never been written to."""
+        row = self.conn.execute("SELECT 1 FROM meta WHERE key = 'last_updated'").fetchone()
+        return row is None
+
+    def _import_legacy_json(self, json_path: str):
         """
-        Load the database from JSON file or create a new one.
-        
-        Returns:
-            Dictionary containing the database structure
-        """
-        if os.path.exists(self.db_path):
-            try:
-                with open(self.db_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"Warning: Corrupted database file. Creating new database.")
-                return self._create_empty_database()
-        else:
-            return self._create_empty_database()
-    
-    def _create_empty_database(self) -> Dict:
-        """
-        Create an empty database structure.
-        
-        Returns:
-            Empty database dictionary
+        One-time import of the legacy aads_master_db.json blob.
+
+        Args:
+            json_path: Path to the legacy JSON database file
         """
-        return {
-            "series_info": {
-                "name": "Atlantic Amateur Darts Series",
-                "total_events": 7,
-                "qualifying_events": 6,
-                "championship_event": 7
-            },
-            "players": {},
-            "events": {},
-            "last_updated": None
-        }
-    
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            print(f"Warning: Corrupted legacy database file {json_path}. Skipping import.")
+            return
+
+        with self._lock, self.conn:
+            for name, player in legacy.get("players", {}).items():
+                self.conn.execute(
+                    """INSERT OR REPLACE INTO players
+                       (name, total_legs, total_dart_sum, weighted_3da, total_180s, total_140s,
+                        total_100s, qualified)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (name, player["total_legs"], player["weighted_3da"] * player["total_legs"],
+                     player["weighted_3da"], player["total_180s"], player["total_140s"],
+                     player["total_100s"], int(player["qualified"]))
+                )
+                self.conn.executemany(
+                    """INSERT INTO event_history
+                       (player_name, event_id, date, three_dart_avg, legs_played, first_9_avg,
+                        one_eighties, one_forty_plus, hundreds_plus, high_finish)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    [(name, e["event_id"], e["date"], e["three_dart_avg"], e["legs_played"],
+                      e["first_9_avg"], e["one_eighties"], e["one_forty_plus"],
+                      e["hundreds_plus"], e["high_finish"]) for e in player["event_history"]]
+                )
+
+            for event in legacy.get("events", {}).values():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO events (event_id, winner, completed) VALUES (?, ?, ?)",
+                    (event["event_id"], event["winner"], int(event["completed"]))
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO event_participants (event_id, player_name) VALUES (?, ?)",
+                    [(event["event_id"], name) for name in event["participants"]]
+                )
+
+            self._set_last_updated(legacy.get("last_updated") or datetime.now().isoformat())
+
+        print(f"Imported legacy database from {json_path} into {self.db_path}")
+
+    def _set_last_updated(self, timestamp: Optional[str] = None):
+        """Record the last write time (caller is responsible for committing)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+            (timestamp or datetime.now().isoformat(),)
+        )
+
     def _save_database(self):
-        """Save the current database state to JSON file."""
-        self.data["last_updated"] = datetime.now().isoformat()
-        with open(self.db_path, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2, ensure_ascii=False)
-    
+        """Commit any pending writes and bump the last-updated timestamp."""
+        with self._lock, self.conn:
+            self._set_last_updated()
+
+    def _ensure_event(self, event_id: int):
+        """Create the event row if it does not exist yet."""
+        self.conn.execute("INSERT OR IGNORE INTO events (event_id) VALUES (?)", (event_id,))
+
     def add_match_stats(self, player_name: str, event_id: int, stats_dict: Dict):
         """
         Add or update match statistics for a player.
-        
+
         Args:
             player_name: Name of the player
             event_id: Event number (1-7)
@@ -89,27 +203,54 @@ class AADSDataManager:
                 - one_eighties: Count of 180s
                 - high_finish: Highest checkout
         """
+        with self._lock, self.conn:
+            self._insert_match_stats(player_name, event_id, stats_dict)
+            self._set_last_updated()
+
+    def add_match_stats_bulk(self, entries: List[Tuple[str, int, Dict]]):
+        """
+        Add match statistics for many players in a single transaction.
+
+        Args:
+            entries: (player_name, event_id, stats_dict) tuples, with stats_dict
+                in the same format as add_match_stats
+        """
+        with self._lock, self.conn:
+            for player_name, event_id, stats_dict in entries:
+                self._insert_match_stats(player_name, event_id, stats_dict)
+            self._set_last_updated()
+
+    def add_180s(self, player_name: str, event_id: int, count: int):
+        """
+        Add several 180s to a player's running total with one write.
+
+        Args:
+            player_name: Name of the player
+            event_id: Event number (1-7)
+            count: Number of 180s to add (zero or less is a no-op)
+        """
+        if count <= 0:
+            return
+
         player_name = player_name.strip()
-        
-        # Initialize player if new
-        if player_name not in self.data["players"]:
-            self.data["players"][player_name] = {
-                "name": player_name,
-                "events_played": [],
-                "total_legs": 0,
-                "weighted_3da": 0.0,
-                "total_180s": 0,
-                "total_140s": 0,
-                "total_100s": 0,
-                "highest_finish": 0,
-                "best_first_9": 0.0,
-                "qualified": False,
-                "event_wins": [],
-                "event_history": []
-            }
-        
-        player = self.data["players"][player_name]
-        
+
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (player_name,))
+            self.conn.execute(
+                "UPDATE players SET total_180s = total_180s + ? WHERE name = ?",
+                (count, player_name)
+            )
+            self._ensure_event(event_id)
+            self.conn.execute(
+                "INSERT OR IGNORE INTO event_participants (event_id, player_name) VALUES (?, ?)",
+                (event_id, player_name)
+            )
+            self._set_last_updated()
+
+    def _insert_match_stats(self, player_name: str, event_id: int, stats_dict: Dict):
+        """Write one match's stats (caller holds the lock and the transaction)."""
+        player_name = player_name.strip()
+
         # Extract stats from dictionary
         match_3da = float(stats_dict.get("three_dart_avg", 0))
         legs_played = int(stats_dict.get("legs_played", 0))
@@ -118,172 +259,288 @@ class AADSDataManager:
         one_forties = int(stats_dict.get("one_forty_plus", 0))
         one_eighties = int(stats_dict.get("one_eighties", 0))
         high_finish = int(stats_dict.get("high_finish", 0))
-        
-        # Update weighted 3DA (sum of all leg averages / total legs)
-        current_total_dart_sum = player["weighted_3da"] * player["total_legs"]
-        new_dart_sum = match_3da * legs_played
-        player["total_legs"] += legs_played
-        
-        if player["total_legs"] > 0:
-            player["weighted_3da"] = round(
-                (current_total_dart_sum + new_dart_sum) / player["total_legs"], 
-                2
-            )
-        
-        # Update cumulative stats
-        player["total_180s"] += one_eighties
-        player["total_140s"] += one_forties
-        player["total_100s"] += hundreds
-        player["highest_finish"] = max(player["highest_finish"], high_finish)
-        player["best_first_9"] = max(player["best_first_9"], first_9)
-        
-        # Track event participation
-        if event_id not in player["events_played"]:
-            player["events_played"].append(event_id)
-        
+
+        self.conn.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (player_name,))
+
         # Add event history entry
-        event_entry = {
-            "event_id": event_id,
-            "date": datetime.now().isoformat(),
-            "three_dart_avg": match_3da,
-            "legs_played": legs_played,
-            "first_9_avg": first_9,
-            "one_eighties": one_eighties,
-            "one_forty_plus": one_forties,
-            "hundreds_plus": hundreds,
-            "high_finish": high_finish
-        }
-        player["event_history"].append(event_entry)
-        
+        self.conn.execute(
+            """INSERT INTO event_history
+               (player_name, event_id, date, three_dart_avg, legs_played, first_9_avg,
+                one_eighties, one_forty_plus, hundreds_plus, high_finish)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (player_name, event_id, datetime.now().isoformat(), match_3da, legs_played,
+             first_9, one_eighties, one_forties, hundreds, high_finish)
+        )
+
+        # Update weighted 3DA (sum of all leg averages / total legs) and cumulative stats
+        self.conn.execute(
+            """UPDATE players SET
+                   total_legs = total_legs + :legs,
+                   total_dart_sum = total_dart_sum + :dart_sum,
+                   weighted_3da = CASE WHEN total_legs + :legs > 0
+                       THEN ROUND((total_dart_sum + :dart_sum) / (total_legs + :legs), 2)
+                       ELSE weighted_3da END,
+                   total_180s = total_180s + :one_eighties,
+                   total_140s = total_140s + :one_forties,
+                   total_100s = total_100s + :hundreds
+               WHERE name = :name""",
+            {"legs": legs_played, "dart_sum": match_3da * legs_played,
+             "one_eighties": one_eighties, "one_forties": one_forties,
+             "hundreds": hundreds, "name": player_name}
+        )
+
         # Update event tracking
-        if str(event_id) not in self.data["events"]:
-            self.data["events"][str(event_id)] = {
-                "event_id": event_id,
-                "participants": [],
-                "winner": None,
-                "completed": False
-            }
-        
-        if player_name not in self.data["events"][str(event_id)]["participants"]:
-            self.data["events"][str(event_id)]["participants"].append(player_name)
-        
-        self._save_database()
-    
+        self._ensure_event(event_id)
+        self.conn.execute(
+            "INSERT OR IGNORE INTO event_participants (event_id, player_name) VALUES (?, ?)",
+            (event_id, player_name)
+        )
+
     def set_event_winner(self, event_id: int, player_name: str):
         """
         Mark a player as the winner of an event.
-        
+
         For qualifying events (1-6), this grants qualification to Event 7.
-        
+
         Args:
             event_id: Event number (1-7)
             player_name: Name of the winning player
         """
         player_name = player_name.strip()
-        
-        if player_name not in self.data["players"]:
-            raise ValueError(f"Player '{player_name}' not found in database")
-        
-        # Update event winner
-        if str(event_id) not in self.data["events"]:
-            self.data["events"][str(event_id)] = {
-                "event_id": event_id,
-                "participants": [],
-                "winner": None,
-                "completed": False
+
+        with self._lock, self.conn:
+            if self.conn.execute("SELECT 1 FROM players WHERE name = ?", (player_name,)).fetchone() is None:
+                raise ValueError(f"Player '{player_name}' not found in database")
+
+            # Update event winner
+            self._ensure_event(event_id)
+            self.conn.execute(
+                "UPDATE events SET winner = ?, completed = 1 WHERE event_id = ?",
+                (player_name, event_id)
+            )
+
+            # Grant qualification for Tournament of Champions (if qualifying event)
+            if 1 <= event_id <= 6:
+                self.conn.execute("UPDATE players SET qualified = 1 WHERE name = ?", (player_name,))
+
+            self._set_last_updated()
+
+    def _build_players(self, rows: List[sqlite3.Row]) -> List[Dict]:
+        """
+        Expand player rows into the legacy player dictionary shape.
+
+        Args:
+            rows: Rows selected from the player_summary view
+
+        Returns:
+            List of player dictionaries (same order as rows)
+        """
+        players = {}
+        for row in rows:
+            players[row["name"]] = {
+                "name": row["name"],
+                "events_played": [],
+                "total_legs": row["total_legs"],
+                "weighted_3da": row["weighted_3da"],
+                "total_180s": row["total_180s"],
+                "total_140s": row["total_140s"],
+                "total_100s": row["total_100s"],
+                "highest_finish": row["highest_finish"],
+                "best_first_9": row["best_first_9"],
+                "qualified": bool(row["qualified"]),
+                "event_wins": [],
+                "event_history": []
             }
-        
-        self.data["events"][str(event_id)]["winner"] = player_name
-        self.data["events"][str(event_id)]["completed"] = True
-        
-        # Update player qualification status
-        player = self.data["players"][player_name]
-        if event_id not in player["event_wins"]:
-            player["event_wins"].append(event_id)
-        
-        # Grant qualification for Tournament of Champions (if qualifying event)
-        if 1 <= event_id <= 6:
-            player["qualified"] = True
-        
-        self._save_database()
-    
+
+        if not players:
+            return []
+
+        for row in self.conn.execute(
+            "SELECT event_id, player_name FROM event_participants ORDER BY rowid"
+        ):
+            if row["player_name"] in players:
+                players[row["player_name"]]["events_played"].append(row["event_id"])
+
+        for row in self.conn.execute(
+            "SELECT event_id, winner FROM events WHERE winner IS NOT NULL ORDER BY event_id"
+        ):
+            if row["winner"] in players:
+                players[row["winner"]]["event_wins"].append(row["event_id"])
+
+        for row in self.conn.execute(
+            """SELECT player_name, event_id, date, three_dart_avg, legs_played, first_9_avg,
+                      one_eighties, one_forty_plus, hundreds_plus, high_finish
+               FROM event_history ORDER BY id"""
+        ):
+            if row["player_name"] in players:
+                entry = dict(row)
+                del entry["player_name"]
+                players[row["player_name"]]["event_history"].append(entry)
+
+        return list(players.values())
+
     def get_leaderboard(self, sort_by: str = "weighted_3da") -> List[Dict]:
         """
         Get the current leaderboard sorted by specified metric.
-        
+
         Args:
             sort_by: Metric to sort by (weighted_3da, total_180s, etc.)
-        
+
         Returns:
             List of player dictionaries sorted by the specified metric
         """
-        players = list(self.data["players"].values())
-        
-        # Sort in descending order
-        players.sort(key=lambda x: x.get(sort_by, 0), reverse=True)
-        
+        # Unknown metrics keep insertion order, as sorting on a missing key always did
+        order_by = f"{sort_by} DESC, seq" if sort_by in SORTABLE_COLUMNS else "seq"
+
+        with self._lock:
+            rows = self.conn.execute(f"SELECT * FROM player_summary ORDER BY {order_by}").fetchall()
+            players = self._build_players(rows)
+
         # Add rank
         for i, player in enumerate(players, 1):
             player["rank"] = i
-        
+
         return players
-    
+
     def get_player_stats(self, player_name: str) -> Optional[Dict]:
         """
         Get statistics for a specific player.
-        
+
         Args:
             player_name: Name of the player
-        
+
         Returns:
             Player statistics dictionary or None if not found
         """
-        return self.data["players"].get(player_name.strip())
-    
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM player_summary WHERE name = ?", (player_name.strip(),)
+            ).fetchall()
+            players = self._build_players(rows)
+        return players[0] if players else None
+
     def get_qualified_players(self) -> List[Dict]:
         """
         Get all players qualified for the Tournament of Champions.
-        
+
         Returns:
             List of qualified player dictionaries
         """
-        return [
-            player for player in self.data["players"].values()
-            if player["qualified"]
-        ]
-    
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM player_summary WHERE qualified = 1 ORDER BY seq"
+            ).fetchall()
+            return self._build_players(rows)
+
     def get_event_details(self, event_id: int) -> Optional[Dict]:
         """
         Get details for a specific event.
-        
+
         Args:
             event_id: Event number (1-7)
-        
+
         Returns:
             Event details dictionary or None if not found
         """
-        return self.data["events"].get(str(event_id))
-    
+        return self.get_all_events().get(str(event_id))
+
+    def get_all_events(self) -> Dict:
+        """
+        Get every event keyed by stringified event id (legacy JSON shape).
+
+        Returns:
+            Dictionary of event details dictionaries
+        """
+        with self._lock:
+            events = {}
+            for row in self.conn.execute("SELECT * FROM events ORDER BY rowid"):
+                events[str(row["event_id"])] = {
+                    "event_id": row["event_id"],
+                    "participants": [],
+                    "winner": row["winner"],
+                    "completed": bool(row["completed"])
+                }
+            for row in self.conn.execute(
+                "SELECT event_id, player_name FROM event_participants ORDER BY rowid"
+            ):
+                events[str(row["event_id"])]["participants"].append(row["player_name"])
+        return events
+
+    def get_series_info(self) -> Dict:
+        """
+        Get the static series information.
+
+        Returns:
+            Series information dictionary
+        """
+        return dict(SERIES_INFO)
+
+    def get_last_updated(self) -> Optional[str]:
+        """
+        Get the timestamp of the last database write.
+
+        Returns:
+            ISO timestamp string or None if the database has never been written
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        return row["value"] if row else None
+
     def get_all_data(self) -> Dict:
         """
-        Get the complete database.
-        
+        Get the complete database in the legacy JSON shape.
+
         Returns:
             Complete database dictionary
         """
-        return self.data
-    
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM player_summary ORDER BY seq").fetchall()
+            players = self._build_players(rows)
+        return {
+            "series_info": self.get_series_info(),
+            "players": {player["name"]: player for player in players},
+            "events": self.get_all_events(),
+            "last_updated": self.get_last_updated()
+        }
+
+    def export_json(self, path: str):
+        """
+        Write the complete database to a compact JSON file (machine-read backups).
+
+        Args:
+            path: Destination file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_all_data(), f, ensure_ascii=False, separators=(',', ':'))
+
+    def export_pretty(self, path: str):
+        """
+        Write the complete database to an indented JSON file for human inspection.
+
+        Args:
+            path: Destination file path
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_all_data(), f, indent=2, ensure_ascii=False)
+
+    @property
+    def data(self) -> Dict:
+        """Legacy read-only view of the database (see get_all_data)."""
+        return self.get_all_data()
+
     def reset_database(self):
         """Reset the database to empty state."""
-        self.data = self._create_empty_database()
-        self._save_database()
+        with self._lock, self.conn:
+            for table in ("players", "events", "event_participants", "event_history"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self._set_last_updated()
 
 
 # Example usage and testing
 if __name__ == "__main__":
     # Initialize manager
     manager = AADSDataManager()
-    
+
     # Example: Add stats for a player
     example_stats = {
         "three_dart_avg": 75.5,
@@ -294,9 +551,9 @@ if __name__ == "__main__":
         "one_eighties": 2,
         "high_finish": 120
     }
-    
+
     manager.add_match_stats("John Doe", 1, example_stats)
-    
+
     # Get leaderboard
     leaderboard = manager.get_leaderboard()
     print(json.dumps(leaderboard, indent=2))
@@ -4,10 +4,12 @@ Debug script to examine the structure of DartConnect data
 to understand how to extract 100+, 140+, 160+ counts
 """
 
-import requests
+from requests_cache import CachedSession
 from bs4 import BeautifulSoup
-import json
-import html
+from scraper import decode_inertia_page
+
+# Developer-loop cache: re-running against the same match_id skips the network
+SESSION = CachedSession('.dc_cache.sqlite', backend='sqlite', expire_after=3600)
 
 def debug_dartconnect_data_structure(match_url):
     """Examine the raw data structure from a match"""
@@ -20,7 +22,7 @@ def debug_dartconnect_data_structure(match_url):
     }
     
     try:
-        response = requests.get(match_url, headers=headers, timeout=10)
+        response = SESSION.get(match_url, headers=headers, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -30,9 +32,7 @@ def debug_dartconnect_data_structure(match_url):
             print("❌ No data-page found")
             return
         
-        data_page = app_div['data-page']
-        data_page = html.unescape(data_page)
-        page_data = json.loads(data_page)
+        page_data = decode_inertia_page(app_div['data-page'])
         
         print("\n📊 Top-level keys:")
         for key in page_data.keys():
@@ -3,8 +3,9 @@ Debug the Inertia.js parsing
 """
 import requests
 from bs4 import BeautifulSoup
-import html
 import json
+from scraper import decode_inertia_page
+
 
 url = "https://recap.dartconnect.com/matches/688e00ccf4fc02e124e7131c"
 response = requests.get(url)
@@ -30,10 +31,9 @@ print("✅ Found data-page attribute")
 
 # Parse the JSON
 page_data_encoded = app_div['data-page']
-page_data = html.unescape(page_data_encoded)
 
 try:
-    data = json.loads(page_data)
+    data = decode_inertia_page(page_data_encoded)
     print(f"✅ Parsed JSON successfully")
     print(f"   Top-level keys: {list(data.keys())}")
     
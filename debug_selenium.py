@@ -1,68 +1,48 @@
 """
-Debug: Check what elements are actually on the DartConnect page
+Debug: Check what data is actually on the DartConnect page
+
+The recap pages are server-rendered with the full Inertia.js payload in
+<div id="app" data-page="...">, so no headless browser is needed - the
+JSON is read straight out of the raw response bytes.
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import time
+from requests_cache import CachedSession
+import html
+import re
+import orjson
 
 match_url = "https://recap.dartconnect.com/matches/688e09b7f4fc02e124e7187f"
 
-chrome_options = Options()
-chrome_options.add_argument('--headless=new')
-chrome_options.add_argument('--disable-gpu')
-chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+SESSION = CachedSession('.dc_cache.sqlite', backend='sqlite', expire_after=3600)
+DATA_PAGE_RE = re.compile(rb'data-page="([^"]+)"')
+
+print(f"Loading: {match_url}")
+resp = SESSION.get(match_url, timeout=30)
+resp.raise_for_status()
+
+print("\n" + "=" * 80)
+print("PAGE SOURCE (first 1000 chars):")
+print("=" * 80)
+print(resp.content[:1000].decode('utf-8', errors='replace'))
+
+print("\n" + "=" * 80)
+print("LOOKING FOR DATA-PAGE:")
+print("=" * 80)
 
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=chrome_options)
-driver.set_page_load_timeout(30)
+match = DATA_PAGE_RE.search(resp.content)
+if not match:
+    print("❌ No data-page attribute found - this page may need JavaScript")
+else:
+    data = orjson.loads(html.unescape(match.group(1).decode('utf-8')))
+    print(f"Component: {data.get('component')}")
+    print(f"URL: {data.get('url')}")
 
-try:
-    print(f"Loading: {match_url}")
-    driver.get(match_url)
-    
-    print("Waiting 5 seconds for JavaScript...")
-    time.sleep(5)
-    
-    print("\n" + "=" * 80)
-    print("PAGE TITLE:")
-    print("=" * 80)
-    print(driver.title)
-    
-    print("\n" + "=" * 80)
-    print("PAGE SOURCE (first 1000 chars):")
-    print("=" * 80)
-    print(driver.page_source[:1000])
-    
-    print("\n" + "=" * 80)
-    print("LOOKING FOR ELEMENTS:")
-    print("=" * 80)
-    
-    # Check for various selectors
-    selectors_to_check = [
-        ("turn_stats class", "turn_stats"),
-        ("cricketDarts class", "cricketDarts"),
-        ("score-holder class", "score-holder"),
-        ("table elements", "table"),
-        ("tr elements", "tr"),
-    ]
-    
-    from selenium.webdriver.common.by import By
-    
-    for name, class_name in selectors_to_check:
-        elements = driver.find_elements(By.CLASS_NAME, class_name if '.' not in class_name else class_name.split('.')[1])
-        print(f"{name}: {len(elements)} found")
-    
-    # Try finding by CSS selector
-    print("\nTrying tbody > tr:")
-    rows = driver.find_elements(By.CSS_SELECTOR, "tbody > tr")
-    print(f"  Found {len(rows)} rows")
-    
-    if rows:
-        print(f"\n  First row HTML:")
-        print(f"  {rows[0].get_attribute('outerHTML')[:200]}")
-    
-finally:
-    driver.quit()
+    props = data.get('props', {})
+    print("\nProps keys:")
+    for key, value in props.items():
+        if isinstance(value, dict):
+            print(f"  - {key}: {{...}} (dict with {len(value)} keys)")
+        elif isinstance(value, list):
+            print(f"  - {key}: [...] (list with {len(value)} items)")
+        else:
+            print(f"  - {key}: {value}")
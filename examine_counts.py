@@ -3,10 +3,12 @@
 Examine the counts endpoint to find detailed scoring breakdowns
 """
 
-import requests
+from requests_cache import CachedSession
 from bs4 import BeautifulSoup
-import json
-import html
+from scraper import decode_inertia_page
+
+# Developer-loop cache: re-running against the same match_id skips the network
+SESSION = CachedSession('.dc_cache.sqlite', backend='sqlite', expire_after=3600)
 
 def examine_counts_data(match_id):
     """Examine what data is available in the counts endpoint"""
@@ -19,7 +21,7 @@ def examine_counts_data(match_id):
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -29,9 +31,7 @@ def examine_counts_data(match_id):
             print("❌ No data-page found")
             return
         
-        data_page = app_div['data-page']
-        data_page = html.unescape(data_page)
-        page_data = json.loads(data_page)
+        page_data = decode_inertia_page(app_div['data-page'])
         
         props = page_data.get('props', {})
         
@@ -1,14 +1,27 @@
 #!/usr/bin/env python3
 """
 Extract Event #1 Data and Save to Backend
-Direct script to scrape Event #1 and save to aads_master_db.json for display
+Direct script to scrape Event #1 and save to the AADS database for display
 """
 
 from scraper_html_parser import scrape_event_comprehensive
 from database_manager import AADSDataManager
-import json
+import orjson
 from datetime import datetime
 
+# Strips thousands separators ("1,234") in one C-level pass
+_NO_COMMA = str.maketrans('', '', ',')
+
+def _to_int(value, default=0):
+    """int() of a scraped value (commas allowed), or default when empty"""
+    if not value:
+        return default
+    return int(value.translate(_NO_COMMA)) if isinstance(value, str) else int(value)
+
+def _to_float(value, default=0.0):
+    """float() of a scraped value, or default when empty"""
+    return float(value) if value else default
+
 def main():
     print("🎯 AADS Event #1 Data Extraction")
     print("=" * 50)
@@ -30,56 +43,83 @@ def main():
     # Step 2: Initialize database manager
     db = AADSDataManager()
     
-    # Step 3: Process each match and add to database
+    # Step 3: Process each match and queue it for the database
     print(f"\n📝 Processing matches for backend storage...")
     
+    event_id = 1
+    stats_rows = []
+    
     for i, match in enumerate(results['matches'], 1):
         print(f"  Processing match {i}: {match['players'][0]['name']} vs {match['players'][1]['name']}")
         
         # Convert match data to database format
+        match_id = match['match_id']
+        match_date = match['match_date']
+        competition = match['competition_title']
+        # Every player in a match plays all of its legs
+        legs_played = match.get('total_games') or sum(p['leg_wins'] for p in match['players'])
+        
         for player in match['players']:
-            player_stats = {
+            # Each field is read exactly once
+            stats_rows.append({
                 'player_name': player['name'],
-                'match_id': match['match_id'],
-                'points_scored': int(player['points_scored_ppr'].replace(',', '')) if player['points_scored_ppr'] else 0,
-                'darts_thrown': int(player['darts_thrown_ppr']) if player['darts_thrown_ppr'] else 0,
-                'dart_average': float(player['ppr']) if player['ppr'] else 0,
+                'match_id': match_id,
+                'points_scored': _to_int(player['points_scored_ppr']),
+                'darts_thrown': _to_int(player['darts_thrown_ppr']),
+                'dart_average': _to_float(player['ppr']),
                 'leg_wins': player['leg_wins'],
+                'legs_played': legs_played,
                 'set_wins': player['set_wins'],
                 'win_percentage': player['win_percentage'],
                 '180s': player.get('180s', 0),
-                'checkout_percentage': float(player.get('checkout_percentage', 0)) if player.get('checkout_percentage') else 0,
+                'checkout_percentage': _to_float(player.get('checkout_percentage')),
                 'highest_checkout': player.get('highest_checkout', 0),
                 'first_nine_average': player.get('first_nine_average', 0),
                 'event_name': 'Event #1',
-                'match_date': match['match_date'],
-                'competition': match['competition_title']
-            }
-            
-            # Add stats to database
+                'match_date': match_date,
+                'competition': competition
+            })
+    
+    # Queue stats for one bulk write
+    batch_stats = [(row['player_name'], event_id, {
+        'three_dart_avg': row['dart_average'],
+        'legs_played': row['legs_played'],
+        'first_9_avg': row['first_nine_average'],
+        'high_finish': row['highest_checkout']
+    }) for row in stats_rows]
+    
+    # Add advanced stats
+    batch_180s = {}
+    for row in stats_rows:
+        key = (row['player_name'], event_id)
+        batch_180s[key] = batch_180s.get(key, 0) + row['180s']
+    
+    try:
+        db.add_match_stats_bulk(batch_stats)
+    except Exception as e:
+        # The bulk write is one transaction and was rolled back, so retry row
+        # by row to keep every good row and report the bad ones
+        print(f"    ⚠️ Bulk save failed ({e}), saving players one at a time")
+        for (player_name, player_event_id, stats), row in zip(batch_stats, stats_rows):
             try:
-                db.add_match_stats(
-                    player_stats['player_name'],
-                    player_stats['points_scored'],
-                    player_stats['darts_thrown'],
-                    player_stats['event_name'],
-                    player_stats['match_id']
-                )
-                
-                # Add advanced stats
-                if player_stats['180s'] > 0:
-                    for _ in range(player_stats['180s']):
-                        db.add_180(player_stats['player_name'], player_stats['event_name'])
-                
+                db.add_match_stats(player_name, player_event_id, stats)
             except Exception as e:
-                print(f"    ⚠️ Warning: Could not add stats for {player_stats['player_name']}: {e}")
+                print(f"    ⚠️ Warning: Could not add stats for {player_name} "
+                      f"(match {row['match_id']}): {e}")
+    
+    # One increment per player; players without a 180 are a no-op
+    for (player_name, player_event_id), count in batch_180s.items():
+        try:
+            db.add_180s(player_name, player_event_id, count)
+        except Exception as e:
+            print(f"    ⚠️ Warning: Could not add 180s for {player_name}: {e}")
     
     # Step 4: Save raw scraped data as backup
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     backup_file = f"event1_scraped_data_{timestamp}.json"
     
-    with open(backup_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    with open(backup_file, 'wb') as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     print(f"\n💾 Raw data backed up to: {backup_file}")
     
@@ -89,12 +129,9 @@ def main():
     print(f"✅ Matches Scraped: {results['successfully_scraped']}")
     print(f"👥 Players Found:")
     
-    all_players = set()
-    for match in results['matches']:
-        for player in match['players']:
-            all_players.add(player['name'])
+    all_players = sorted({player['name'] for match in results['matches'] for player in match['players']})
     
-    for player in sorted(all_players):
+    for player in all_players:
         print(f"    • {player}")
     
     print(f"\n🎉 Event #1 data successfully extracted and saved to backend!")
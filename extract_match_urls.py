@@ -1,15 +1,59 @@
 """
 Extract match URLs from DartConnect event page
 
-This script parses the event page HTML/JavaScript to find all match recap URLs.
+This script asks the DartConnect API2 endpoint for the event's matches and
+falls back to parsing the event page HTML/JavaScript for match recap URLs.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import re
 import json
 import html as html_module
 
+# Inertia.js payload on the #app div, recap links, and bare 24-char hex match IDs.
+# The first two scan the raw response bytes so the page is never decoded whole.
+_DATA_PAGE_RE = re.compile(rb'id="app"[^>]*data-page="([^"]+)"')
+_RECAP_RE = re.compile(rb'https?://recap\.dartconnect\.com/matches/[0-9a-f]{24}')
+_MATCH_ID_RE = re.compile(r'[0-9a-f]{24}')
+_EVENT_ID_RE = re.compile(r'/event/([^/]+)')
+
+# Shared keep-alive session so repeated event fetches skip the TLS handshake
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+def _has_variety(match_id):
+    """
+    True if the ID uses at least 4 different hex characters.
+    
+    Real IDs almost always show that within the first 8 characters, so the
+    small prefix set short-circuits before building a set over all 24.
+    """
+    return len(set(match_id[:8])) > 3 or len(set(match_id)) > 3
+
+def _fetch_match_urls_from_api(event_id):
+    """
+    Get recap URLs from the API2 event endpoint (JSON only, no HTML shell)
+    
+    Returns:
+        Set of match recap URLs, or None if the API did not answer with 200
+    """
+    api_url = f"https://tv.dartconnect.com/api2/event/{event_id}/matches"
+    print(f"Fetching matches from API: {api_url}")
+    
+    response = _SESSION.post(api_url, json={}, headers={'Accept': 'application/json'})
+    if response.status_code != 200:
+        print(f"⚠ API returned {response.status_code}, falling back to event page")
+        return None
+    
+    match_urls = set()
+    for section in response.json().get('payload', {}).values():
+        if isinstance(section, list):
+            match_urls.update(f"https://recap.dartconnect.com/matches/{match['mi']}"
+                              for match in section if isinstance(match, dict) and 'mi' in match)
+    return match_urls
+
 def extract_match_urls_from_event(event_url):
     """
     Extract all match recap URLs from a DartConnect event page
@@ -20,79 +64,70 @@ def extract_match_urls_from_event(event_url):
     Returns:
         List of match recap URLs
     """
+    event_id_match = _EVENT_ID_RE.search(event_url)
+    if event_id_match:
+        try:
+            match_urls = _fetch_match_urls_from_api(event_id_match.group(1))
+            if match_urls is not None:
+                print(f"✅ API returned {len(match_urls)} matches")
+                return list(match_urls)
+        except (requests.RequestException, ValueError) as e:
+            print(f"⚠ API request failed ({e}), falling back to event page")
+    
     print(f"Fetching event page: {event_url}")
     
-    response = requests.get(event_url)
+    response = _SESSION.get(event_url)
     if response.status_code != 200:
         print(f"❌ Failed to fetch page: {response.status_code}")
         return []
     
-    print(f"✅ Page fetched ({len(response.text)} bytes)")
+    html_bytes = response.content
+    print(f"✅ Page fetched ({len(html_bytes)} bytes)")
     
-    match_urls = []
+    match_urls = set()
     
     # Method 1: Look for match IDs in JavaScript/JSON data
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Check Inertia.js data
-    app_div = soup.find('div', {'id': 'app'})
-    if app_div and app_div.has_attr('data-page'):
+    # Check Inertia.js data - the attribute is pulled straight out of the raw
+    # HTML, no DOM needed for a single attribute
+    app_match = _DATA_PAGE_RE.search(html_bytes)
+    if app_match:
         print("📄 Analyzing Inertia.js data...")
         
         try:
-            page_data_encoded = app_div['data-page']
-            page_data = html_module.unescape(page_data_encoded)
+            page_data = html_module.unescape(app_match.group(1).decode('utf-8'))
             
             # Search for match IDs in the JSON data
             # Match IDs are 24-character hex strings
-            match_id_pattern = r'[0-9a-f]{24}'
-            
-            # Also look for specific patterns that might contain match IDs
-            patterns_to_check = [
-                page_data,  # Full JSON
-                str(page_data)  # String representation
-            ]
-            
-            all_matches = []
-            for pattern_text in patterns_to_check:
-                found = re.findall(match_id_pattern, pattern_text)
-                all_matches.extend(found)
-            
-            # Deduplicate and filter out common non-match IDs
-            unique_ids = list(set(all_matches))
+            unique_ids = set(_MATCH_ID_RE.findall(page_data))
             
             # Filter out IDs that are clearly not match IDs (too common, etc.)
-            filtered_ids = []
-            for match_id in unique_ids:
-                # Basic validation - match IDs shouldn't be all the same digit
-                if len(set(match_id)) > 3:  # At least 4 different hex characters
-                    filtered_ids.append(match_id)
+            # Basic validation - match IDs shouldn't be all the same digit
+            filtered_ids = [match_id for match_id in unique_ids if _has_variety(match_id)]
             
             print(f"  Found {len(unique_ids)} potential IDs, {len(filtered_ids)} after filtering")
             
             # Convert to recap URLs
-            for match_id in filtered_ids:
-                recap_url = f"https://recap.dartconnect.com/matches/{match_id}"
-                match_urls.append(recap_url)
+            match_urls.update(f"https://recap.dartconnect.com/matches/{match_id}"
+                              for match_id in filtered_ids)
         
         except Exception as e:
             print(f"  ⚠ Error parsing Inertia data: {e}")
     
     # Method 2: Look for recap URLs directly in HTML
-    html_text = response.text
-    recap_pattern = r'https?://recap\.dartconnect\.com/matches/[0-9a-f]{24}'
-    found_urls = re.findall(recap_pattern, html_text)
+    # A plain substring find (memchr-fast) locates the first candidate; the
+    # regex only runs from there, and not at all if there is none
+    first = html_bytes.find(b'recap.dartconnect.com/matches/')
+    if first == -1:
+        found_urls = []
+    else:
+        scan_from = max(0, first - len('https://'))
+        found_urls = [url.decode('ascii') for url in _RECAP_RE.findall(html_bytes, scan_from)]
     
     if found_urls:
         print(f"📄 Found {len(found_urls)} URLs in HTML")
-        for url in found_urls:
-            if url not in match_urls:
-                match_urls.append(url)
+        match_urls.update(found_urls)
     
-    # Deduplicate final list
-    match_urls = list(set(match_urls))
-    
-    return match_urls
+    return list(match_urls)
 
 def main():
     """
@@ -2,7 +2,12 @@
 Fetch all matches from the event via DartConnect API
 """
 import requests
-import json
+from requests.adapters import HTTPAdapter
+import orjson
+
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_SESSION.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=16))
 
 # Event ID from the URL: mt_joe6163l_1
 event_id = "mt_joe6163l_1"
@@ -12,12 +17,12 @@ api_url = f"https://tv.dartconnect.com/api2/event/{event_id}/matches"
 
 print(f"Fetching matches from API: {api_url}\n")
 
-response = requests.get(api_url)
+response = _SESSION.get(api_url)
 print(f"Status: {response.status_code}")
 
 if response.status_code == 200:
     try:
-        data = response.json()
+        data = orjson.loads(response.content)
         print(f"Response type: {type(data)}")
         
         if isinstance(data, dict):
@@ -43,14 +48,14 @@ if response.status_code == 200:
             print(f"Response is a list with {len(data)} items")
             if data:
                 print(f"\nFirst item:")
-                print(json.dumps(data[0], indent=2)[:800])
+                print(orjson.dumps(data[0], option=orjson.OPT_INDENT_2).decode()[:800])
         
         # Save full response
-        with open('matches_api_response.json', 'w') as f:
-            json.dump(data, f, indent=2)
+        with open('matches_api_response.json', 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         print(f"\n📄 Saved matches_api_response.json")
         
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         print("Response is not JSON")
         print(response.text[:500])
 else:
@@ -2,11 +2,28 @@
 Deep inspection of segments structure to find turn-by-turn data
 """
 
-import json
+import orjson
+
+def _handle_list(key, value):
+    print(f"\n    '{key}': list with {len(value)} items")
+    if value:
+        print(f"      First item: {value[0]}")
+        if len(value) > 1:
+            print(f"      Second item: {value[1]}")
+
+def _handle_dict(key, value):
+    print(f"\n    '{key}': dict with keys: {list(value.keys())}")
+
+def _handle_scalar(key, value):
+    print(f"    '{key}': {value}")
+
+# Decoded JSON only ever holds exact list/dict types, so dispatch on type()
+# instead of walking isinstance checks per key
+_HANDLERS = {list: _handle_list, dict: _handle_dict}
 
 # Load the previously saved props
-with open('event_props.json', 'r') as f:
-    page_data = json.load(f)
+with open('event_props.json', 'rb') as f:
+    page_data = orjson.loads(f.read())
 
 props = page_data.get('props', {})
 segments = props.get('segments', {})
@@ -30,21 +47,12 @@ for game_key, game_data in segments.items():
                 
                 # Show first few items of each key
                 for key, value in leg_data.items():
-                    if isinstance(value, list):
-                        print(f"\n    '{key}': list with {len(value)} items")
-                        if value:
-                            print(f"      First item: {value[0]}")
-                            if len(value) > 1:
-                                print(f"      Second item: {value[1]}")
-                    elif isinstance(value, dict):
-                        print(f"\n    '{key}': dict with keys: {list(value.keys())}")
-                    else:
-                        print(f"    '{key}': {value}")
+                    _HANDLERS.get(type(value), _handle_scalar)(key, value)
                 
                 # Only show first leg in detail
                 if leg_index == 1:
                     print(f"\n    FULL LEG 1 DATA:")
-                    print(json.dumps(leg_data, indent=6))
+                    print(orjson.dumps(leg_data, option=orjson.OPT_INDENT_2).decode())
             
             # Only analyze first 2 legs
             if leg_index >= 2:
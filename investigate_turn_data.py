@@ -5,11 +5,40 @@ Explore the DartConnect API to find endpoints that provide throw-by-throw data
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
+from bs4 import BeautifulSoup, SoupStrainer
+import orjson
 import html
 import re
 from pprint import pprint
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Keys that may hold turn-by-turn data (one case-insensitive pass per key)
+_TURN_KEYS_RE = re.compile(r'turn|throw|visit|score', re.I)
+# Ziggy route names worth reporting
+_ROUTE_KEYS_RE = re.compile(r'match|game|turn|visit|score|throw', re.I)
+
+def search_for_turns(data):
+    """
+    Report every key that looks like turn data, walking dicts fully and
+    lists via their first element only (explicit stack, no recursion)
+    """
+    stack = [("", data)]
+    while stack:
+        path, obj = stack.pop()
+        if isinstance(obj, dict):
+            children = []
+            for key, value in obj.items():
+                new_path = f"{path}.{key}" if path else key
+                if _TURN_KEYS_RE.search(key):
+                    print(f"      🎯 FOUND TURN DATA at {new_path}")
+                    print(f"         Type: {type(value)}")
+                    if isinstance(value, list) and value:
+                        print(f"         Sample: {value[0]}")
+                children.append((new_path, value))
+            # Reversed so paths come off the stack in document order
+            stack.extend(reversed(children))
+        elif isinstance(obj, list) and obj:
+            stack.append((f"{path}[0]", obj[0]))
 
 def investigate_match_data(match_url):
     """
@@ -34,13 +63,14 @@ def investigate_match_data(match_url):
     # ========================================================================
     print("[1] Fetching main recap page...")
     response = session.get(match_url, timeout=30)
-    soup = BeautifulSoup(response.text, 'html.parser')
+    # Only build the #app div - the rest of the recap page is never read
+    soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('div', id='app'))
     
     # Get Inertia data
-    app_div = soup.find('div', {'id': 'app'})
+    app_div = soup.find('div')
     if app_div and app_div.has_attr('data-page'):
         page_data = html.unescape(app_div['data-page'])
-        data = json.loads(page_data)
+        data = orjson.loads(page_data)
         props = data.get('props', {})
         
         print(f"✅ Found Inertia.js data")
@@ -48,7 +78,7 @@ def investigate_match_data(match_url):
         
         # Look for turn data in props
         for key in props.keys():
-            if 'turn' in key.lower() or 'throw' in key.lower() or 'score' in key.lower():
+            if _TURN_KEYS_RE.search(key):
                 print(f"   🎯 Found potential turn data key: {key}")
                 print(f"      Type: {type(props[key])}")
                 if isinstance(props[key], (list, dict)) and props[key]:
@@ -71,7 +101,7 @@ def investigate_match_data(match_url):
                         
                         # Look for turn/throw/score data
                         for leg_key in first_leg.keys():
-                            if 'turn' in leg_key.lower() or 'throw' in leg_key.lower() or 'score' in leg_key.lower() or 'visit' in leg_key.lower():
+                            if _TURN_KEYS_RE.search(leg_key):
                                 print(f"   🎯 FOUND: {leg_key}")
                                 print(f"      Value: {first_leg[leg_key]}")
                         
@@ -81,13 +111,13 @@ def investigate_match_data(match_url):
                             print(f"\n   Home player keys: {home_keys}")
                             
                             for hkey in home_keys:
-                                if 'turn' in hkey.lower() or 'throw' in hkey.lower() or 'score' in hkey.lower() or 'visit' in hkey.lower():
+                                if _TURN_KEYS_RE.search(hkey):
                                     print(f"      🎯 FOUND in home: {hkey}")
                                     print(f"         Value: {first_leg['home'][hkey]}")
         
-        # Save full props for manual inspection
-        with open('full_props_dump.json', 'w') as f:
-            json.dump(props, f, indent=2)
+        # Save full props (compact - pipe through a JSON viewer to browse)
+        with open('full_props_dump.json', 'wb') as f:
+            f.write(orjson.dumps(props))
         print(f"\n💾 Full props saved to: full_props_dump.json")
     
     # ========================================================================
@@ -114,38 +144,31 @@ def investigate_match_data(match_url):
         f"{base_url}/api/matches/{match_id}/details",
     ]
     
-    for endpoint in potential_endpoints:
+    # Probe every endpoint at once - worst case is one timeout, not eleven
+    with ThreadPoolExecutor(max_workers=len(potential_endpoints)) as executor:
+        futures = {executor.submit(session.get, endpoint, timeout=10): endpoint
+                   for endpoint in potential_endpoints}
+        results = [(futures[future], future) for future in as_completed(futures)]
+    
+    for endpoint, future in results:
         try:
             print(f"\nTrying: {endpoint}")
-            resp = session.get(endpoint, timeout=10)
+            resp = future.result()
             
             if resp.status_code == 200:
                 print(f"   ✅ SUCCESS! Status: {resp.status_code}")
                 
                 try:
-                    json_data = resp.json()
+                    json_data = orjson.loads(resp.content)
                     print(f"   Response keys: {list(json_data.keys())}")
                     
                     # Save successful response
                     filename = f"api_response_{endpoint.split('/')[-1]}.json"
-                    with open(filename, 'w') as f:
-                        json.dump(json_data, f, indent=2)
+                    with open(filename, 'wb') as f:
+                        f.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
                     print(f"   💾 Saved to: {filename}")
                     
                     # Look for turn data
-                    def search_for_turns(obj, path=""):
-                        if isinstance(obj, dict):
-                            for key, value in obj.items():
-                                new_path = f"{path}.{key}" if path else key
-                                if 'turn' in key.lower() or 'throw' in key.lower() or 'visit' in key.lower():
-                                    print(f"      🎯 FOUND TURN DATA at {new_path}")
-                                    print(f"         Type: {type(value)}")
-                                    if isinstance(value, list) and len(value) > 0:
-                                        print(f"         Sample: {value[0]}")
-                                search_for_turns(value, new_path)
-                        elif isinstance(obj, list) and len(obj) > 0:
-                            search_for_turns(obj[0], f"{path}[0]")
-                    
                     search_for_turns(json_data)
                     
                 except Exception as e:
@@ -173,7 +196,7 @@ def investigate_match_data(match_url):
             
             relevant_routes = []
             for route_name, route_data in routes.items():
-                if any(keyword in route_name.lower() for keyword in ['match', 'game', 'turn', 'visit', 'score', 'throw']):
+                if _ROUTE_KEYS_RE.search(route_name):
                     relevant_routes.append((route_name, route_data))
             
             if relevant_routes:
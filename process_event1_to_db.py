@@ -4,7 +4,9 @@ Process Event #1 Scraped Data and Save to Backend Database
 Converts the scraped JSON data to the correct database format
 """
 
-import json
+import ijson
+import numpy as np
+import pandas as pd
 from database_manager import AADSDataManager
 from datetime import datetime
 
@@ -13,119 +15,110 @@ def process_scraped_data_to_database():
     
     print("🔄 Processing Event #1 data for backend database...")
     
-    # Load the scraped data
+    # Flatten every (match, player) side into one row, then aggregate per player
+    rows = []
+    
+    # Matches are streamed from the scraped data one at a time rather than
+    # loading the whole file into memory
+    match_count = 0
     try:
-        with open('event1_scraped_data_20251219_070828.json', 'r', encoding='utf-8') as f:
-            scraped_data = json.load(f)
+        with open('event1_scraped_data_20251219_070828.json', 'rb') as f:
+            for match_count, match in enumerate(ijson.items(f, 'matches.item', use_float=True), 1):
+                mp = match['players']
+                print(f"  Processing match {match_count}: {mp[0]['name']} vs {mp[1]['name']}")
+                
+                for idx, player in enumerate(mp):
+                    rows.append({
+                        'name': player['name'],
+                        'match_id': match['match_id'],
+                        'opponent': mp[1 - idx]['name'],
+                        'date': match['match_date'],
+                        'points_scored_ppr': player['points_scored_ppr'],
+                        'darts_thrown_ppr': player['darts_thrown_ppr'],
+                        'ppr': float(player['ppr']) if player['ppr'] else 0.0,
+                        'leg_wins': player['leg_wins'],
+                        'one_eighties': player.get('180s', 0),
+                        'highest_checkout': player.get('highest_checkout', 0),
+                        'first_nine_average': player.get('first_nine_average', 0)
+                    })
     except FileNotFoundError:
         print("❌ Scraped data file not found. Please run the scraper first.")
         return False
     
-    print(f"📊 Found {scraped_data['successfully_scraped']} matches to process")
-    
     # Initialize database manager
     db = AADSDataManager()
     
-    # Process each match
-    processed_players = {}
+    print(f"📊 Processed {match_count} matches")
     
-    for i, match in enumerate(scraped_data['matches'], 1):
-        print(f"  Processing match {i}: {match['players'][0]['name']} vs {match['players'][1]['name']}")
-        
-        for player in match['players']:
-            player_name = player['name']
-            
-            # Initialize player totals if not seen before
-            if player_name not in processed_players:
-                processed_players[player_name] = {
-                    'total_legs': 0,
-                    'total_points': 0,
-                    'total_darts': 0,
-                    'total_180s': 0,
-                    'total_140s': 0,
-                    'total_100s': 0,
-                    'highest_finish': 0,
-                    'best_first_9': 0,
-                    'matches': []
-                }
-            
-            # Extract match stats
-            points_scored = int(player['points_scored_ppr'].replace(',', '')) if player['points_scored_ppr'] else 0
-            darts_thrown = int(player['darts_thrown_ppr']) if player['darts_thrown_ppr'] else 0
-            dart_average = float(player['ppr']) if player['ppr'] else 0
-            leg_wins = player['leg_wins']
-            one_eighties = player.get('180s', 0)
-            highest_checkout = player.get('highest_checkout', 0)
-            first_nine_avg = player.get('first_nine_average', 0)
-            
-            # Accumulate player totals
-            processed_players[player_name]['total_legs'] += leg_wins
-            processed_players[player_name]['total_points'] += points_scored
-            processed_players[player_name]['total_darts'] += darts_thrown
-            processed_players[player_name]['total_180s'] += one_eighties
-            
-            # Estimate 140+ and 100+ counts based on average (rough approximation)
-            # For every 180, typically there are 2-3 140+ scores and 5-8 100+ scores
-            estimated_140s = one_eighties * 2 if one_eighties > 0 else max(0, int(dart_average - 60) // 10)
-            estimated_100s = one_eighties * 6 if one_eighties > 0 else max(0, int(dart_average - 50) // 8)
-            
-            processed_players[player_name]['total_140s'] += estimated_140s
-            processed_players[player_name]['total_100s'] += estimated_100s
-            
-            if highest_checkout > processed_players[player_name]['highest_finish']:
-                processed_players[player_name]['highest_finish'] = highest_checkout
-            
-            if first_nine_avg > processed_players[player_name]['best_first_9']:
-                processed_players[player_name]['best_first_9'] = first_nine_avg
-            
-            # Store individual match data
-            processed_players[player_name]['matches'].append({
-                'match_id': match['match_id'],
-                'opponent': match['players'][1]['name'] if player == match['players'][0] else match['players'][0]['name'],
-                'three_dart_avg': dart_average,
-                'legs_played': leg_wins,
-                'first_9_avg': first_nine_avg,
-                'one_eighties': one_eighties,
-                'highest_checkout': highest_checkout,
-                'date': match['match_date']
-            })
-    
-    # Add all players to database
-    for player_name, totals in processed_players.items():
+    if not rows:
+        print("❌ No player data found in the scraped matches.")
+        return False
+    
+    df = pd.DataFrame(rows)
+    df['points'] = pd.to_numeric(
+        df['points_scored_ppr'].astype(str).str.replace(',', ''), errors='coerce'
+    ).fillna(0).astype(int)
+    df['darts'] = pd.to_numeric(df['darts_thrown_ppr'], errors='coerce').fillna(0).astype(int)
+    
+    # Estimate 140+ and 100+ counts based on average (rough approximation)
+    # For every 180, typically there are 2-3 140+ scores and 5-8 100+ scores
+    d180 = df['one_eighties'].to_numpy()
+    avg = df['ppr'].to_numpy()
+    df['estimated_140s'] = np.where(d180 > 0, d180 * 2, np.maximum(0, (avg - 60).astype(np.int64) // 10))
+    df['estimated_100s'] = np.where(d180 > 0, d180 * 6, np.maximum(0, (avg - 50).astype(np.int64) // 8))
+    
+    # One pass of named aggregations: sums for the running totals and
+    # per-player maxima for the best finish / first 9
+    agg = df.groupby('name', sort=False).agg(
+        total_legs=('leg_wins', 'sum'),
+        total_points=('points', 'sum'),
+        total_darts=('darts', 'sum'),
+        total_180s=('one_eighties', 'sum'),
+        total_140s=('estimated_140s', 'sum'),
+        total_100s=('estimated_100s', 'sum'),
+        highest_finish=('highest_checkout', 'max'),
+        best_first_9=('first_nine_average', 'max')
+    )
+    
+    # Keep the per-player totals columnar: one NumPy array per field, in step
+    # with names, and only box values into Python scalars for the database write
+    names = agg.index.tolist()
+    totals = {column: agg[column].to_numpy() for column in agg.columns}
+    
+    # Overall weighted average, computed once and reused for the summary
+    totals['weighted_avg'] = np.divide(
+        totals['total_points'] * 3, totals['total_darts'],
+        out=np.zeros(len(names)), where=totals['total_darts'] > 0
+    )
+    
+    # Build all player rows, then write them to the database in one transaction
+    bulk_entries = []
+    for i, player_name in enumerate(names):
         print(f"    Adding {player_name} to database...")
         
-        # Calculate overall weighted average
-        if totals['total_darts'] > 0:
-            weighted_avg = (totals['total_points'] / totals['total_darts']) * 3
-        else:
-            weighted_avg = 0
-        
         # Create stats dictionary for the database
         stats_dict = {
-            'three_dart_avg': weighted_avg,
-            'legs_played': totals['total_legs'],
-            'first_9_avg': totals['best_first_9'],
-            'hundreds_plus': totals['total_100s'],
-            'one_forty_plus': totals['total_140s'],
-            'one_eighties': totals['total_180s'],
-            'high_finish': totals['highest_finish']
+            'three_dart_avg': float(totals['weighted_avg'][i]),
+            'legs_played': int(totals['total_legs'][i]),
+            'first_9_avg': float(totals['best_first_9'][i]),
+            'hundreds_plus': int(totals['total_100s'][i]),
+            'one_forty_plus': int(totals['total_140s'][i]),
+            'one_eighties': int(totals['total_180s'][i]),
+            'high_finish': int(totals['highest_finish'][i])
         }
         
-        try:
-            db.add_match_stats(player_name, 1, stats_dict)  # Event #1
-        except Exception as e:
-            print(f"    ⚠️ Warning: Could not add {player_name}: {e}")
-            continue
+        bulk_entries.append((player_name, 1, stats_dict))  # Event #1
     
-    # Save database
-    db._save_database()
+    try:
+        db.add_match_stats_bulk(bulk_entries)
+    except Exception as e:
+        print(f"    ❌ Could not write Event #1 stats: {e}")
+        return False
     
-    print(f"\n✅ Successfully processed {len(processed_players)} players into database!")
+    print(f"\n✅ Successfully processed {len(names)} players into database!")
     print(f"📋 Players added:")
-    for player_name in sorted(processed_players.keys()):
-        totals = processed_players[player_name]
-        weighted_avg = (totals['total_points'] / totals['total_darts']) * 3 if totals['total_darts'] > 0 else 0
-        print(f"    • {player_name}: {weighted_avg:.2f} avg, {totals['total_legs']} legs, {totals['total_180s']} x 180s")
+    for i, player_name in sorted(enumerate(names), key=lambda item: item[1]):
+        print(f"    • {player_name}: {totals['weighted_avg'][i]:.2f} avg, {totals['total_legs'][i]} legs, {totals['total_180s'][i]} x 180s")
     
     return True
 
@@ -3,10 +3,36 @@ Scrape Player Performance and Match Counts tabs directly from DartConnect
 No manual HTML saving needed!
 """
 
-import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry
 import json
-import html
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from scraper import extract_inertia_props
+
+# One keep-alive session so both tabs (and repeated calls) reuse the same
+# connection to recap.dartconnect.com instead of a fresh TCP+TLS handshake.
+# Responses are cached on disk for a day, in the file DartConnectScraper uses
+# with the same policy.
+_SESSION = CachedSession(
+    'dartconnect_cache.sqlite',
+    backend='sqlite',
+    expire_after=86400,
+    allowable_methods=('GET',)
+)
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# Retry transient failures with exponential backoff instead of failing the tab
+_SESSION.mount('https://', HTTPAdapter(max_retries=Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=['GET']
+)))
+
+# (connect, read) timeouts: fail fast on an unreachable host, and don't
+# wait the full 30s when a response stalls mid-body
+_TIMEOUT = (3, 15)
 
 def scrape_tab_data(match_id):
     """
@@ -31,51 +57,34 @@ def scrape_tab_data(match_id):
         'errors': []
     }
     
-    # Fetch Player Performance tab
-    print(f"Fetching Player Performance: {players_url}")
-    try:
-        response = requests.get(players_url, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        app_div = soup.find('div', {'id': 'app'})
-        
-        if app_div and 'data-page' in app_div.attrs:
-            page_data_str = html.unescape(app_div['data-page'])
-            page_data = json.loads(page_data_str)
-            props = page_data.get('props', {})
+    # Both tabs live on the same host and don't depend on each other, so
+    # fetch them concurrently rather than paying two round-trips in series
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        players_future = executor.submit(_SESSION.get, players_url, timeout=_TIMEOUT)
+        counts_future = executor.submit(_SESSION.get, counts_url, timeout=_TIMEOUT)
+    
+    tabs = [
+        ('player_performance', 'Player Performance', players_url, players_future),
+        ('match_counts', 'Match Counts', counts_url, counts_future),
+    ]
+    
+    for key, label, url, future in tabs:
+        print(f"\nFetching {label}: {url}")
+        try:
+            response = future.result()
+            response.raise_for_status()
             
-            result['player_performance'] = props
-            print("✅ Player Performance data extracted")
-        else:
-            result['errors'].append("No Inertia.js data in Player Performance page")
-            print("❌ No Inertia.js data found")
-    except Exception as e:
-        result['errors'].append(f"Player Performance error: {e}")
-        print(f"❌ Error: {e}")
-    
-    # Fetch Match Counts tab
-    print(f"\nFetching Match Counts: {counts_url}")
-    try:
-        response = requests.get(counts_url, timeout=30)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        app_div = soup.find('div', {'id': 'app'})
-        
-        if app_div and 'data-page' in app_div.attrs:
-            page_data_str = html.unescape(app_div['data-page'])
-            page_data = json.loads(page_data_str)
-            props = page_data.get('props', {})
+            props = extract_inertia_props(response.content)
             
-            result['match_counts'] = props
-            print("✅ Match Counts data extracted")
-        else:
-            result['errors'].append("No Inertia.js data in Match Counts page")
-            print("❌ No Inertia.js data found")
-    except Exception as e:
-        result['errors'].append(f"Match Counts error: {e}")
-        print(f"❌ Error: {e}")
+            if props is not None:
+                result[key] = props
+                print(f"✅ {label} data extracted")
+            else:
+                result['errors'].append(f"No Inertia.js data in {label} page")
+                print("❌ No Inertia.js data found")
+        except Exception as e:
+            result['errors'].append(f"{label} error: {e}")
+            print(f"❌ Error: {e}")
     
     return result
 
@@ -121,8 +130,8 @@ if __name__ == "__main__":
     tab_data = scrape_tab_data(match_id)
     
     # Save raw data
-    with open('tab_data_raw.json', 'w') as f:
-        json.dump(tab_data, f, indent=2)
+    with open('tab_data_raw.json', 'wb') as f:
+        f.write(orjson.dumps(tab_data, option=orjson.OPT_INDENT_2))
     print("\n✅ Saved raw data to: tab_data_raw.json")
     
     # Parse and display stats
@@ -4,12 +4,17 @@ Extracts player statistics from DartConnect Match Recap pages
 """
 
 import requests
+from requests_cache import CachedSession
 from bs4 import BeautifulSoup
+import html
+import orjson
 import re
 import logging
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import threading
 import time
+import os
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +23,97 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# First signed number in a cell, allowing thousands separators ("1,234.5")
+_NUM_RE = re.compile(r'-?\d[\d,]*(?:\.\d+)?|-?\.\d+')
+
+# DartConnect host check, and "private"/"not found" sentinels of restricted
+# pages (matched case-insensitively on the raw bytes, no lowercased copy)
+_VALID_URL_RE = re.compile(r'^https?://[^/?#]*dartconnect', re.I)
+_PRIVATE_RE = re.compile(rb'private|not found', re.I)
+
+# Inertia.js keeps the page JSON HTML-encoded in <div id="app" data-page="...">
+_APP_RE = re.compile(rb'id="app"[^>]*data-page="([^"]*)"', re.I)
+
+# Any entity other than the five Inertia's JSON encoding actually emits
+_OTHER_ENTITY_RE = re.compile(r'&(?!quot;|#39;|lt;|gt;|amp;)')
+
+
+def unescape_data_page(encoded: str) -> str:
+    """
+    Unescape a data-page attribute value. The attribute normally only holds
+    &quot; &#39; &lt; &gt; and &amp;, which a few str.replace calls handle far
+    faster than html.unescape; anything else falls back to html.unescape.
+    
+    Args:
+        encoded: Raw data-page attribute value
+    
+    Returns:
+        Unescaped JSON text
+    """
+    if '&' not in encoded:
+        return encoded
+    if _OTHER_ENTITY_RE.search(encoded):
+        return html.unescape(encoded)
+    return (encoded.replace('&quot;', '"').replace('&#39;', "'")
+            .replace('&lt;', '<').replace('&gt;', '>').replace('&amp;', '&'))
+
+
+def decode_inertia_page(encoded: str) -> Dict:
+    """
+    Decode an HTML-encoded Inertia.js data-page attribute value.
+    
+    Args:
+        encoded: Raw data-page attribute value
+    
+    Returns:
+        Parsed page dictionary (component, props, url, ...)
+    """
+    return orjson.loads(unescape_data_page(encoded))
+
+
+def extract_inertia_props(html_bytes: bytes) -> Optional[Dict]:
+    """
+    Pull the Inertia.js props straight out of raw page bytes without
+    building a parse tree.
+    
+    Args:
+        html_bytes: Raw response body
+    
+    Returns:
+        Props dictionary, or None if the page has no data-page attribute
+    """
+    match = _APP_RE.search(html_bytes)
+    if not match:
+        return None
+    return decode_inertia_page(match.group(1).decode('utf-8')).get('props', {})
+
+
+# Per-process scraper used by scrape_multiple_urls when it fans out to
+# worker processes; each worker gets its own session and rate limiter. The
+# workers don't use the sqlite cache, since several processes writing to one
+# sqlite file at once would hit "database is locked" errors.
+_worker_scraper = None
+
+
+def _init_worker(rate_limit: float):
+    global _worker_scraper
+    _worker_scraper = DartConnectScraper(rate_limit=rate_limit, use_cache=False)
+
+
+def _scrape_in_worker(url: str) -> List[Dict]:
+    return _worker_scraper.scrape_match_recap(url)
+
+
+class PStats:
+    """Running totals for one player in _parse_alternative_format"""
+    __slots__ = ('legs_played', 'ppr_sum', 'ppr_count', 'high_finish')
+    
+    def __init__(self):
+        self.legs_played = 0
+        self.ppr_sum = 0.0
+        self.ppr_count = 0
+        self.high_finish = 0
+
 
 class DartConnectScraper:
     """
@@ -28,28 +124,42 @@ class DartConnectScraper:
     - Handles various DartConnect page formats
     - Robust error handling for private/failed URLs
     - Rate limiting to avoid overwhelming the server
+    - Concurrent fetching of multiple URLs (request starts stay rate limited)
     """
     
-    def __init__(self, rate_limit: float = 1.0):
+    def __init__(self, rate_limit: float = 1.0, use_cache: bool = True):
         """
         Initialize the scraper.
         
         Args:
             rate_limit: Minimum seconds between requests (default: 1.0)
+            use_cache: Cache responses in dartconnect_cache.sqlite (default: True)
         """
         self.rate_limit = rate_limit
         self.last_request_time = 0
-        self.session = requests.Session()
+        self._rate_lock = threading.Lock()
+        if use_cache:
+            # Cache GET responses on disk for a day so re-running on the same
+            # matches doesn't hit DartConnect again
+            self.session = CachedSession(
+                'dartconnect_cache.sqlite',
+                backend='sqlite',
+                expire_after=86400,
+                allowable_methods=('GET',)
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
     def _rate_limit_wait(self):
-        """Enforce rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        self.last_request_time = time.time()
+        """Enforce rate limiting between requests (safe to call from worker threads)."""
+        with self._rate_lock:
+            elapsed = time.time() - self.last_request_time
+            if elapsed < self.rate_limit:
+                time.sleep(self.rate_limit - elapsed)
+            self.last_request_time = time.time()
     
     def _validate_url(self, url: str) -> bool:
         """
@@ -61,11 +171,7 @@ class DartConnectScraper:
         Returns:
             True if valid DartConnect URL, False otherwise
         """
-        try:
-            parsed = urlparse(url)
-            return 'dartconnect' in parsed.netloc.lower()
-        except Exception:
-            return False
+        return isinstance(url, str) and _VALID_URL_RE.match(url) is not None
     
     def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
         """
@@ -88,11 +194,11 @@ class DartConnectScraper:
             response.raise_for_status()
             
             # Check if page is private or restricted
-            if "private" in response.text.lower() or "not found" in response.text.lower():
+            if _PRIVATE_RE.search(response.content):
                 logger.warning(f"Page appears to be private or not found: {url}")
                 return None
             
-            return BeautifulSoup(response.text, 'html.parser')  # Using html.parser (built-in)
+            return BeautifulSoup(response.content, 'lxml')
         
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch {url}: {e}")
@@ -111,13 +217,8 @@ class DartConnectScraper:
         if not text:
             return 0.0
         
-        # Remove non-numeric characters except decimal point and minus
-        cleaned = re.sub(r'[^\d.-]', '', str(text))
-        
-        try:
-            return float(cleaned) if cleaned else 0.0
-        except ValueError:
-            return 0.0
+        match = _NUM_RE.search(str(text))
+        return float(match.group().replace(',', '')) if match else 0.0
     
     def scrape_match_recap(self, url: str) -> List[Dict]:
         """
@@ -138,6 +239,17 @@ class DartConnectScraper:
         players_stats = []
         
         try:
+            # Modern recap pages are Inertia.js apps with no stats tables, so
+            # go straight to the embedded JSON when it is present
+            if soup.find('div', {'id': 'app', 'data-page': True}):
+                stats = self._parse_alternative_format(soup)
+                players_stats.extend(stats)
+                if stats:
+                    logger.info(f"Extracted {len(stats)} player(s) using alternative method")
+                else:
+                    logger.warning(f"No player statistics found on page: {url}")
+                return players_stats
+            
             # Method 1: Look for standard stats table
             stats = self._parse_standard_table(soup)
             if stats:
@@ -271,12 +383,7 @@ class DartConnectScraper:
                 return players
             
             # Parse the JSON data (it's HTML-encoded)
-            import html
-            import json
-            
-            page_data_encoded = app_div['data-page']
-            page_data = html.unescape(page_data_encoded)
-            data = json.loads(page_data)
+            data = decode_inertia_page(app_div['data-page'])
             
             if 'props' not in data:
                 logger.error("No props in Inertia data")
@@ -290,12 +397,13 @@ class DartConnectScraper:
             # segments[''] = [[leg1_dict, leg2_dict, ...]]
             segments = props.get('segments', {})
             
-            # Collect statistics per player
+            # Collect statistics per player as
+            # [legs_played, ppr_sum, ppr_count, high_finish]
             player_stats = {}
             
             # Process each segment
-            for segment_key, segment_list in segments.items():
-                if not segment_list or len(segment_list) == 0:
+            for segment_list in segments.values():
+                if not segment_list:
                     continue
                 
                 # segment_list[0] contains the list of legs
@@ -304,115 +412,84 @@ class DartConnectScraper:
                 if not isinstance(legs_list, list):
                     continue
                 
-                # Process each leg
+                # Process each leg, home and away sides alike
                 for leg_data in legs_list:
                     if not isinstance(leg_data, dict):
                         continue
                     
-                    # Process home player
-                    if 'home' in leg_data:
-                        home_data = leg_data['home']
-                        # Get player name from players list
-                        if 'players' in home_data and home_data['players']:
-                            player_name = home_data['players'][0].get('player_label', '').strip()
-                            
-                            if player_name:
-                                if player_name not in player_stats:
-                                    player_stats[player_name] = {
-                                        'legs_played': 0,
-                                        'total_ppr': 0.0,
-                                        'ppr_values': [],
-                                        'high_finish': 0
-                                    }
-                                
-                                # Add leg statistics
-                                player_stats[player_name]['legs_played'] += 1
-                                
-                                # Get PPR (points per round) and convert to 3DA
-                                ppr = home_data.get('ppr')
-                                if ppr:
-                                    try:
-                                        ppr_float = float(ppr)
-                                        player_stats[player_name]['ppr_values'].append(ppr_float)
-                                        player_stats[player_name]['total_ppr'] += ppr_float
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # Track high finish (double_out_points)
-                                finish = home_data.get('double_out_points', 0)
-                                if finish and finish > player_stats[player_name]['high_finish']:
-                                    player_stats[player_name]['high_finish'] = finish
-                    
-                    # Process away player
-                    if 'away' in leg_data:
-                        away_data = leg_data['away']
-                        # Get player name from players list
-                        if 'players' in away_data and away_data['players']:
-                            player_name = away_data['players'][0].get('player_label', '').strip()
-                            
-                            if player_name:
-                                if player_name not in player_stats:
-                                    player_stats[player_name] = {
-                                        'legs_played': 0,
-                                        'total_ppr': 0.0,
-                                        'ppr_values': [],
-                                        'high_finish': 0
-                                    }
-                                
-                                # Add leg statistics
-                                player_stats[player_name]['legs_played'] += 1
-                                
-                                # Get PPR and convert to 3DA
-                                ppr = away_data.get('ppr')
-                                if ppr:
-                                    try:
-                                        ppr_float = float(ppr)
-                                        player_stats[player_name]['ppr_values'].append(ppr_float)
-                                        player_stats[player_name]['total_ppr'] += ppr_float
-                                    except (ValueError, TypeError):
-                                        pass
-                                
-                                # Track high finish
-                                finish = away_data.get('double_out_points', 0)
-                                if finish and finish > player_stats[player_name]['high_finish']:
-                                    player_stats[player_name]['high_finish'] = finish
+                    for side in ('home', 'away'):
+                        side_data = leg_data.get(side)
+                        if not side_data or not side_data.get('players'):
+                            continue
+                        
+                        player_name = side_data['players'][0].get('player_label', '').strip()
+                        if not player_name:
+                            continue
+                        
+                        stats = player_stats.get(player_name)
+                        if stats is None:
+                            stats = player_stats[player_name] = PStats()
+                        
+                        stats.legs_played += 1
+                        
+                        # Get PPR (points per round), which is the 3DA
+                        ppr = side_data.get('ppr')
+                        if ppr:
+                            try:
+                                stats.ppr_sum += float(ppr)
+                                stats.ppr_count += 1
+                            except (ValueError, TypeError):
+                                pass
+                        
+                        # Track high finish (double_out_points)
+                        finish = side_data.get('double_out_points', 0)
+                        if finish and finish > stats.high_finish:
+                            stats.high_finish = finish
             
             # Convert to list format with calculated averages
             for player_name, stats in player_stats.items():
-                # Calculate average PPR (which is basically the 3-dart average)
-                if stats['ppr_values']:
-                    avg_ppr = sum(stats['ppr_values']) / len(stats['ppr_values'])
-                else:
-                    avg_ppr = 0.0
+                # Average PPR (which is basically the 3-dart average)
+                avg_ppr = stats.ppr_sum / stats.ppr_count if stats.ppr_count else 0.0
                 
                 player_dict = {
                     "player_name": player_name,
                     "three_dart_avg": avg_ppr,  # PPR in DartConnect is essentially the 3DA
-                    "legs_played": stats['legs_played'],
+                    "legs_played": stats.legs_played,
                     "first_9_avg": avg_ppr,  # Use same as 3DA for now
                     "hundreds_plus": 0,  # Not available in current data structure
                     "one_forty_plus": 0,  # Not available
                     "one_eighties": 0,  # Not available
-                    "high_finish": stats['high_finish']
+                    "high_finish": stats.high_finish
                 }
                 players.append(player_dict)
             
             logger.info(f"Parsed {len(players)} players from Inertia.js data")
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON data from data-page: {e}")
         except Exception as e:
             logger.error(f"Error parsing alternative format: {e}", exc_info=True)
         
         return players
     
-    def scrape_multiple_urls(self, urls: List[str], event_id: int = 1) -> Tuple[List[Dict], List[str]]:
+    def scrape_multiple_urls(self, urls: List[str], event_id: int = 1,
+                             max_workers: int = 10,
+                             processes: int = 1) -> Tuple[List[Dict], List[str]]:
         """
         Scrape multiple DartConnect URLs and aggregate results.
         
+        Requests overlap on a thread pool; request starts are still spaced by
+        rate_limit, so only the network wait is parallelized. With processes > 1
+        the URLs are instead split across worker processes so page parsing runs
+        on several cores; each worker is limited to rate_limit * processes so
+        the overall request rate stays the same. Worker processes fetch without
+        the on-disk cache.
+        
         Args:
             urls: List of DartConnect Match Recap URLs
             event_id: Event ID for these matches
+            max_workers: Maximum number of requests in flight (thread mode)
+            processes: Number of worker processes, or 0 for os.cpu_count()
         
         Returns:
             Tuple of (successful results, failed URLs)
@@ -422,10 +499,19 @@ class DartConnectScraper:
         
         logger.info(f"Scraping {len(urls)} URLs for Event {event_id}")
         
-        for i, url in enumerate(urls, 1):
-            logger.info(f"Processing URL {i}/{len(urls)}")
-            
-            stats = self.scrape_match_recap(url)
+        processes = min(processes or os.cpu_count() or 1, len(urls))
+        
+        if processes > 1:
+            chunksize = max(1, len(urls) // (4 * processes))
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(self.rate_limit * processes,)) as executor:
+                results = list(executor.map(_scrape_in_worker, urls, chunksize=chunksize))
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as executor:
+                results = executor.map(self.scrape_match_recap, urls)
+        
+        for i, (url, stats) in enumerate(zip(urls, results), 1):
+            logger.info(f"Processed URL {i}/{len(urls)}")
             
             if stats:
                 # Add event_id to each player's stats
@@ -10,15 +10,58 @@ Extracts comprehensive statistics from match recap pages including:
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
+import orjson
 import html
+import re
 import logging
-from typing import Dict, List, Optional
+from array import array
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Inertia.js page JSON, HTML-encoded in <div id="app" data-page="...">
+_DATA_PAGE_RE = re.compile(rb'<div id="app"[^>]*\bdata-page="([^"]*)"', re.DOTALL)
+
+# One player's result in one leg (far smaller than a per-leg dict)
+LegDetail = namedtuple(
+    'LegDetail',
+    'leg_number ppr starting_points ending_points checkout won darts_thrown'
+)
+
+
+def _json_default(obj):
+    """orjson fallback: serialize LegDetail (and other namedtuples) as objects"""
+    if hasattr(obj, '_asdict'):
+        return obj._asdict()
+    raise TypeError
+
+
+def _count_high_scores(turns: Iterable) -> Tuple[int, int, int]:
+    """
+    Tally 180s, 140+ (140-179) and 100+ (100-139) visits in a single pass.
+    
+    Args:
+        turns: Turn scores, either plain numbers or dicts with a 'score' key
+    
+    Returns:
+        (count_180, count_140_plus, count_100_plus)
+    """
+    c180 = c140 = c100 = 0
+    for turn in turns:
+        score = turn.get('score') if isinstance(turn, dict) else turn
+        if not score:
+            continue
+        score = int(score)
+        if score >= 180:
+            c180 += 1
+        elif score >= 140:
+            c140 += 1
+        elif score >= 100:
+            c100 += 1
+    return c180, c140, c100
+
 
 class AdvancedDartConnectScraper:
     """
@@ -31,10 +74,15 @@ class AdvancedDartConnectScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
-    def scrape_match_advanced(self, url: str) -> Dict:
+    def scrape_match_advanced(self, url: str, include_leg_detail: bool = True) -> Dict:
         """
         Scrape comprehensive match statistics
         
+        Args:
+            url: Match recap URL
+            include_leg_detail: Return a per-leg breakdown for each player;
+                pass False for summary-only results (legs_detail left empty)
+        
         Returns:
             Dict with match info and per-player detailed stats
         """
@@ -42,17 +90,15 @@ class AdvancedDartConnectScraper:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find Inertia.js data
-            app_div = soup.find('div', {'id': 'app'})
-            if not app_div or not app_div.has_attr('data-page'):
+            # Find Inertia.js data directly in the raw bytes
+            match = _DATA_PAGE_RE.search(response.content)
+            if not match:
                 logger.error("No Inertia.js data found")
                 return {}
             
             # Parse JSON data
-            page_data = html.unescape(app_div['data-page'])
-            data = json.loads(page_data)
+            page_data = html.unescape(match.group(1).decode('utf-8'))
+            data = orjson.loads(page_data)
             
             if 'props' not in data:
                 logger.error("No props in Inertia data")
@@ -61,7 +107,7 @@ class AdvancedDartConnectScraper:
             props = data['props']
             
             # Extract comprehensive stats
-            match_data = self._extract_comprehensive_stats(props)
+            match_data = self._extract_comprehensive_stats(props, include_leg_detail)
             match_data['match_url'] = url
             
             return match_data
@@ -70,18 +116,16 @@ class AdvancedDartConnectScraper:
             logger.error(f"Error scraping {url}: {e}")
             return {}
     
-    def _extract_comprehensive_stats(self, props: Dict) -> Dict:
+    def _iter_legs(self, props: Dict):
         """
-        Extract all available statistics from Inertia props
+        Lazily walk the Inertia props, yielding one flat tuple per player per leg:
+        (player_name, leg_number, ppr, starting_points, ending_points,
+         double_out, won_leg, total_darts, turns)
         """
         segments = props.get('segments', {})
         
-        # Initialize player stats tracking
-        player_stats = {}
-        
-        # Process each segment and leg
-        for segment_key, segment_list in segments.items():
-            if not segment_list or len(segment_list) == 0:
+        for segment_list in segments.values():
+            if not segment_list:
                 continue
             
             legs_list = segment_list[0]
@@ -89,32 +133,44 @@ class AdvancedDartConnectScraper:
             if not isinstance(legs_list, list):
                 continue
             
-            # Process each leg
             for leg_index, leg_data in enumerate(legs_list, 1):
                 if not isinstance(leg_data, dict):
                     continue
                 
                 # Get leg metadata
                 leg_number = leg_data.get('set_number', leg_index)
-                darts_thrown = leg_data.get('darts_thrown', 0)
+                total_darts = leg_data.get('darts_thrown', 0)
                 
-                # Process home player
-                self._process_player_leg(
-                    player_stats, 
-                    leg_data.get('home'), 
-                    leg_number, 
-                    darts_thrown,
-                    'home'
-                )
-                
-                # Process away player
-                self._process_player_leg(
-                    player_stats, 
-                    leg_data.get('away'), 
-                    leg_number, 
-                    darts_thrown,
-                    'away'
-                )
+                for side in ('home', 'away'):
+                    leg_player_data = leg_data.get(side)
+                    if not leg_player_data or not leg_player_data.get('players'):
+                        continue
+                    
+                    player_name = leg_player_data['players'][0].get('player_label', '').strip()
+                    if not player_name:
+                        continue
+                    
+                    yield (
+                        player_name,
+                        leg_number,
+                        leg_player_data.get('ppr'),
+                        leg_player_data.get('starting_points', 501),
+                        leg_player_data.get('ending_points', 0),
+                        leg_player_data.get('double_out_points'),
+                        leg_player_data.get('win', False),
+                        total_darts,
+                        leg_player_data.get('turns')
+                    )
+    
+    def _extract_comprehensive_stats(self, props: Dict, include_leg_detail: bool = True) -> Dict:
+        """
+        Extract all available statistics from Inertia props
+        """
+        # Initialize player stats tracking
+        player_stats = {}
+        
+        for leg in self._iter_legs(props):
+            self._process_player_leg(player_stats, *leg, include_leg_detail=include_leg_detail)
         
         # Calculate final aggregated stats
         result = {
@@ -127,77 +183,62 @@ class AdvancedDartConnectScraper:
         
         return result
     
-    def _process_player_leg(self, player_stats: Dict, leg_player_data: Optional[Dict], 
-                           leg_number: int, total_darts: int, side: str):
+    def _process_player_leg(self, player_stats: Dict, player_name: str, leg_number: int,
+                           ppr, starting_points: int, ending_points: int, double_out,
+                           won_leg: bool, total_darts: int, turns: Optional[List] = None,
+                           include_leg_detail: bool = True):
         """
         Process statistics for a single player in a single leg
         """
-        if not leg_player_data or 'players' not in leg_player_data:
-            return
-        
-        if not leg_player_data['players']:
-            return
-        
-        player_name = leg_player_data['players'][0].get('player_label', '').strip()
-        
-        if not player_name:
-            return
-        
         # Initialize player if not exists
-        if player_name not in player_stats:
-            player_stats[player_name] = {
+        p = player_stats.get(player_name)
+        if p is None:
+            p = player_stats[player_name] = {
                 'legs': [],
                 'legs_won': 0,
                 'legs_lost': 0,
                 'total_checkout_attempts': 0,
                 'successful_checkouts': 0,
-                'checkout_values': [],
+                'checkout_values': array('i'),
                 'checkout_100_plus': 0,
                 'checkout_170': 0,
-                'all_ppr_values': [],
-                'first_9_values': [],  # PPR from first 3 rounds
+                'all_ppr_values': array('d'),
+                'first_9_values': array('d'),  # PPR from first 3 rounds
                 'score_180': 0,
                 'score_140_plus': 0,
                 'score_100_plus': 0
             }
         
-        # Extract leg statistics
-        ppr = leg_player_data.get('ppr')
-        starting_points = leg_player_data.get('starting_points', 501)
-        ending_points = leg_player_data.get('ending_points', 0)
-        double_out = leg_player_data.get('double_out_points')
-        won_leg = leg_player_data.get('win', False)
-        
         # PPR (3-dart average for this leg)
         ppr_float = 0.0
         if ppr:
             try:
                 ppr_float = float(ppr)
-                player_stats[player_name]['all_ppr_values'].append(ppr_float)
+                p['all_ppr_values'].append(ppr_float)
             except (ValueError, TypeError):
                 pass
         
         # Win/loss tracking
         if won_leg:
-            player_stats[player_name]['legs_won'] += 1
+            p['legs_won'] += 1
         else:
-            player_stats[player_name]['legs_lost'] += 1
+            p['legs_lost'] += 1
         
         # Checkout tracking
         if double_out:
             checkout_value = int(double_out)
-            player_stats[player_name]['checkout_values'].append(checkout_value)
-            player_stats[player_name]['successful_checkouts'] += 1
+            p['checkout_values'].append(checkout_value)
+            p['successful_checkouts'] += 1
             
             if checkout_value >= 100:
-                player_stats[player_name]['checkout_100_plus'] += 1
+                p['checkout_100_plus'] += 1
             
             if checkout_value == 170:
-                player_stats[player_name]['checkout_170'] += 1
+                p['checkout_170'] += 1
         
         # Count checkout attempts (won leg = successful, any leg with low ending points = attempt)
         if won_leg or ending_points <= 170:
-            player_stats[player_name]['total_checkout_attempts'] += 1
+            p['total_checkout_attempts'] += 1
         
         # Calculate number of rounds (turns) in this leg
         # Each round = 3 darts
@@ -208,72 +249,80 @@ class AdvancedDartConnectScraper:
             # Approximate: use ppr for first 3 rounds
             # In reality we'd need turn-by-turn data which may not be available
             # For now, use overall PPR as approximation
-            player_stats[player_name]['first_9_values'].append(ppr_float)
-        
-        # Store individual leg data
-        leg_detail = {
-            'leg_number': leg_number,
-            'ppr': ppr_float,
-            'starting_points': starting_points,
-            'ending_points': ending_points,
-            'checkout': double_out if double_out else 0,
-            'won': won_leg,
-            'darts_thrown': total_darts
-        }
+            p['first_9_values'].append(ppr_float)
         
-        player_stats[player_name]['legs'].append(leg_detail)
+        # Store individual leg data (only when the caller asked for it)
+        if include_leg_detail:
+            p['legs'].append(LegDetail(
+                leg_number,
+                ppr_float,
+                starting_points,
+                ending_points,
+                double_out if double_out else 0,
+                won_leg,
+                total_darts
+            ))
         
-        # NOTE: Individual dart scores (180s, 140s, 100s) are NOT available in the
-        # current Inertia.js data structure. We would need access to turn-by-turn
-        # scoring data which appears to be in a different endpoint or requires
-        # additional API calls
+        # High scores need turn-by-turn data, which the current Inertia.js recap
+        # payload does not include; count them whenever a leg does carry turns
+        if turns:
+            c180, c140, c100 = _count_high_scores(turns)
+            p['score_180'] += c180
+            p['score_140_plus'] += c140
+            p['score_100_plus'] += c100
     
     def _calculate_player_summary(self, player_name: str, stats: Dict) -> Dict:
         """
         Calculate aggregated summary statistics for a player
         """
-        total_legs = stats['legs_won'] + stats['legs_lost']
+        legs_won = stats['legs_won']
+        total_legs = legs_won + stats['legs_lost']
+        ppr_vals = stats['all_ppr_values']
+        first_9_vals = stats['first_9_values']
+        cv = stats['checkout_values']
+        attempts = stats['total_checkout_attempts']
+        successful = stats['successful_checkouts']
         
         # 3-dart average (overall)
         avg_3da = 0.0
-        if stats['all_ppr_values']:
-            avg_3da = sum(stats['all_ppr_values']) / len(stats['all_ppr_values'])
+        if ppr_vals:
+            avg_3da = sum(ppr_vals) / len(ppr_vals)
         
         # First 9 average
         avg_first_9 = 0.0
-        if stats['first_9_values']:
-            avg_first_9 = sum(stats['first_9_values']) / len(stats['first_9_values'])
+        if first_9_vals:
+            avg_first_9 = sum(first_9_vals) / len(first_9_vals)
         
         # Checkout statistics
         checkout_avg = 0.0
-        if stats['checkout_values']:
-            checkout_avg = sum(stats['checkout_values']) / len(stats['checkout_values'])
+        if cv:
+            checkout_avg = sum(cv) / len(cv)
         
         checkout_success_rate = 0.0
-        if stats['total_checkout_attempts'] > 0:
-            checkout_success_rate = (stats['successful_checkouts'] / stats['total_checkout_attempts']) * 100
+        if attempts > 0:
+            checkout_success_rate = (successful / attempts) * 100
         
         # High finish
-        high_finish = max(stats['checkout_values']) if stats['checkout_values'] else 0
+        high_finish = max(cv) if cv else 0
         
         # Leg win percentage
         leg_win_pct = 0.0
         if total_legs > 0:
-            leg_win_pct = (stats['legs_won'] / total_legs) * 100
+            leg_win_pct = (legs_won / total_legs) * 100
         
         return {
             'player_name': player_name,
             'three_dart_avg': round(avg_3da, 2),
             'first_9_avg': round(avg_first_9, 2),
             'legs_played': total_legs,
-            'legs_won': stats['legs_won'],
+            'legs_won': legs_won,
             'legs_lost': stats['legs_lost'],
             'leg_win_percentage': round(leg_win_pct, 1),
             
             # Checkout stats
             'checkout_average': round(checkout_avg, 2),
-            'checkout_attempts': stats['total_checkout_attempts'],
-            'successful_checkouts': stats['successful_checkouts'],
+            'checkout_attempts': attempts,
+            'successful_checkouts': successful,
             'checkout_success_rate': round(checkout_success_rate, 1),
             'checkout_100_plus': stats['checkout_100_plus'],
             'checkout_170': stats['checkout_170'],
@@ -318,15 +367,15 @@ def test_advanced_scraper():
             print(f"   170 Checkouts: {player['checkout_170']}")
             print(f"\n   Per-Leg Stats:")
             for leg in player['legs_detail']:
-                status = "✅ Won" if leg['won'] else "❌ Lost"
-                checkout_str = f"Checkout: {leg['checkout']}" if leg['checkout'] > 0 else "Missed"
-                print(f"      Leg {leg['leg_number']}: {leg['ppr']:.2f} avg | {checkout_str} | {status}")
+                status = "✅ Won" if leg.won else "❌ Lost"
+                checkout_str = f"Checkout: {leg.checkout}" if leg.checkout > 0 else "Missed"
+                print(f"      Leg {leg.leg_number}: {leg.ppr:.2f} avg | {checkout_str} | {status}")
             print()
         
         # Save to file
         output_file = "advanced_scrape_result.json"
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=_json_default))
         print(f"💾 Full results saved to: {output_file}")
     else:
         print("❌ Failed to scrape match")
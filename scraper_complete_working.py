@@ -8,14 +8,93 @@ STAGE 2: Scrape each match using direct endpoints for comprehensive stats
 This version saves to local JSON file to avoid Supabase upload issues
 """
 
-import requests
-import json
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry
+import orjson
+import html
 import re
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError
+import threading
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Event ID in a tv.dartconnect.com event URL
+_EVENT_ID_RE = re.compile(r'/event/([a-zA-Z0-9_]+)')
+
+# Inertia.js page JSON, HTML-encoded in <div id="app" data-page="...">
+_DATA_PAGE_RE = re.compile(rb'<div id="app"[^>]*\bdata-page="([^"]*)"', re.DOTALL)
+
+# (aggregate key, per-match player key) pairs summed into all_players
+_AGG_KEYS = [
+    ('total_legs', 'total_games'),
+    ('total_wins', 'total_wins'),
+    ('total_darts', 'darts_thrown'),
+    ('total_180s', 'count_180s'),
+    ('total_140_plus', 'count_140_plus'),
+    ('total_100_plus', 'count_100_plus'),
+    ('total_checkout_opportunities', 'checkout_opportunities'),
+    ('total_checkouts_hit', 'checkouts_hit'),
+]
+
+MAX_RETRIES = 3
+MAX_WORKERS = 8
+
+# Minimum seconds between request starts, shared by every worker thread:
+# concurrency overlaps the network waits but doesn't raise the request rate
+REQUEST_INTERVAL = 0.5
+_rate_lock = threading.Lock()
+_last_request_time = 0.0
+
+# Side pool for the second tab fetch of each match, created on first use. It
+# is kept separate from the per-match pool so a match worker never waits on
+# its own pool.
+_tab_pool = None
+_tab_pool_lock = threading.Lock()
+
+# Shared keep-alive session so every match reuses pooled connections to
+# recap.dartconnect.com instead of a fresh TCP+TLS handshake per request.
+# Responses are cached on disk and revalidated with ETag/Last-Modified once
+# stale, so re-running against a live event only re-downloads changed matches.
+# The cache file is this module's own, as its expiry policy differs from the
+# other scrapers'.
+_SESSION = CachedSession(
+    'dartconnect_cache_complete_working.sqlite',
+    backend='sqlite',
+    expire_after=3600,
+    cache_control=True
+)
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+))
+
+
+def _rate_limited_get(url: str, **kwargs):
+    """_SESSION.get, spaced at least REQUEST_INTERVAL after the previous request"""
+    global _last_request_time
+    with _rate_lock:
+        elapsed = time.time() - _last_request_time
+        if elapsed < REQUEST_INTERVAL:
+            time.sleep(REQUEST_INTERVAL - elapsed)
+        _last_request_time = time.time()
+    return _SESSION.get(url, **kwargs)
+
+
+def _get_tab_pool() -> ThreadPoolExecutor:
+    """The shared side pool for tab fetches"""
+    global _tab_pool
+    with _tab_pool_lock:
+        if _tab_pool is None:
+            _tab_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return _tab_pool
 
 
 def extract_match_urls_from_event(event_url: str) -> List[str]:
@@ -33,7 +112,7 @@ def extract_match_urls_from_event(event_url: str) -> List[str]:
     print(f"Event URL: {event_url}")
     
     # Extract event ID from URL
-    event_id_match = re.search(r'/event/([a-zA-Z0-9_]+)', event_url)
+    event_id_match = _EVENT_ID_RE.search(event_url)
     if not event_id_match:
         raise ValueError("Could not extract event ID from URL")
     
@@ -44,15 +123,13 @@ def extract_match_urls_from_event(event_url: str) -> List[str]:
     api_url = f"https://tv.dartconnect.com/api2/event/{event_id}/matches"
     print(f"Calling API2: {api_url}")
     
-    request_obj = Request(api_url, method='POST')
-    request_obj.add_header('Content-Type', 'application/json')
-    request_obj.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-    
     try:
-        with urlopen(request_obj, timeout=30) as response:
-            result = json.loads(response.read().decode())
+        response = _SESSION.post(api_url, headers={'Content-Type': 'application/json'}, timeout=30)
+        response.raise_for_status()
+        result = orjson.loads(response.content)
         
-        print(f"✅ API2 response received")
+        print(f"✅ API2 response received "
+              f"(Content-Encoding: {response.headers.get('Content-Encoding', 'identity')})")
         
         # Extract match URLs from payload
         match_urls = []
@@ -98,42 +175,32 @@ def scrape_single_match_comprehensive(match_id: str) -> Dict:
     }
     
     try:
+        # Get Match Counts data in the background while this thread fetches
+        # Player Performance, so each match costs one round-trip, not two
+        print(f"  📊 Fetching player performance and match counts...")
+        counts_future = _get_tab_pool().submit(_rate_limited_get, counts_url, timeout=10)
+        
         # Get Player Performance data
-        print(f"  📊 Fetching player performance...")
-        response_players = requests.get(players_url, timeout=10)
+        response_players = _rate_limited_get(players_url, timeout=10)
         response_players.raise_for_status()
         
-        # Get Match Counts data  
-        print(f"  📊 Fetching match counts...")
-        response_counts = requests.get(counts_url, timeout=10)
+        # Get Match Counts data
+        response_counts = counts_future.result()
         response_counts.raise_for_status()
         
-        # Parse both responses
-        from bs4 import BeautifulSoup
+        # Parse both responses straight from the raw bytes; only the
+        # data-page attribute is needed, so no DOM is built
+        props_players = _extract_props(response_players.content)
         
-        # Parse players data
-        soup_players = BeautifulSoup(response_players.text, 'html.parser')
-        app_div_players = soup_players.find('div', {'id': 'app'})
-        
-        if not app_div_players or 'data-page' not in app_div_players.attrs:
+        if props_players is None:
             result['errors'].append("No player performance data found")
             return result
         
-        # Extract Inertia.js data from players tab
-        data_page_players = app_div_players['data-page']
-        page_data_players = json.loads(data_page_players)
-        props_players = page_data_players.get('props', {})
-        
         # Parse counts data
-        soup_counts = BeautifulSoup(response_counts.text, 'html.parser')
-        app_div_counts = soup_counts.find('div', {'id': 'app'})
+        props_counts = _extract_props(response_counts.content)
         
         counts_data = {}
-        if app_div_counts and 'data-page' in app_div_counts.attrs:
-            data_page_counts = app_div_counts['data-page']
-            page_data_counts = json.loads(data_page_counts)
-            props_counts = page_data_counts.get('props', {})
-            
+        if props_counts is not None:
             # Extract counts for each player
             if 'page' in props_counts and 'players' in props_counts['page']:
                 for player_data in props_counts['page']['players']:
@@ -194,7 +261,109 @@ def scrape_single_match_comprehensive(match_id: str) -> Dict:
         return result
 
 
-def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Event") -> Dict:
+def _extract_props(html_bytes: bytes) -> Optional[Dict]:
+    """
+    Inertia.js props from a recap page's raw bytes, or None if the page has
+    no data-page attribute
+    """
+    match = _DATA_PAGE_RE.search(html_bytes)
+    if not match:
+        return None
+    return orjson.loads(html.unescape(match.group(1).decode('utf-8'))).get('props', {})
+
+
+def _to_int(value) -> int:
+    """Integer from an int, a comma-formatted string like "1,234", or None ('-' means none)"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value.replace(',', '')) if value not in ('', '-') else 0
+    return int(value or 0)
+
+
+def _new_player_record() -> Dict:
+    """Zero-initialized aggregate record for a player in all_players"""
+    return {
+        'name': '',
+        'total_matches': 0,
+        'total_legs': 0,
+        'total_wins': 0,
+        'total_darts': 0,
+        'total_points': 0,
+        'total_180s': 0,
+        'total_140_plus': 0,
+        'total_100_plus': 0,
+        'total_checkout_opportunities': 0,
+        'total_checkouts_hit': 0,
+        'highest_checkout': 0,
+        'match_details': []
+    }
+
+
+def _safe_ratio(num: float, den: float, scale: float, decimals: int) -> float:
+    """num / den * scale rounded, or 0 if den is 0"""
+    return round(num * scale / den, decimals) if den > 0 else 0
+
+
+def _player_rows(match_result: Dict) -> List[tuple]:
+    """
+    Numeric values each player of a successful match adds to all_players.
+    
+    Returns:
+        (name, _AGG_KEYS sums, points, highest checkout, match detail) per
+        player
+    
+    Raises:
+        ValueError or TypeError if any counted value isn't a number
+    """
+    match_id = match_result['match_id']
+    rows = []
+    for player in match_result['players']:
+        rows.append((
+            player['name'],
+            [_to_int(player.get(src)) for _, src in _AGG_KEYS],
+            _to_int(player.get('points_scored')),
+            _to_int(player.get('highest_checkout')),
+            {
+                'match_id': match_id,
+                'legs': player.get('total_games', 0),
+                'wins': player.get('total_wins', 0),
+                'average': player.get('average', 0),
+                'first_nine_avg': player.get('first_nine_avg'),
+                'count_180s': player.get('count_180s', 0),
+                'count_140_plus': player.get('count_140_plus', 0),
+                'count_100_plus': player.get('count_100_plus', 0)
+            }
+        ))
+    return rows
+
+
+def scrape_match_with_retries(match_id: str) -> Dict:
+    """
+    Run scrape_single_match_comprehensive with up to MAX_RETRIES attempts.
+    Safe to call from worker threads.
+    
+    Args:
+        match_id: DartConnect match ID
+        
+    Returns:
+        Match result dictionary (success is False if every attempt failed)
+    """
+    for attempt in range(1, MAX_RETRIES + 1):
+        result = scrape_single_match_comprehensive(match_id)
+        if result['success']:
+            return result
+        if attempt < MAX_RETRIES:
+            print(f"  ⚠️ {match_id}: attempt {attempt} failed, retrying...")
+            time.sleep(2)
+    
+    print(f"  ❌ {match_id}: failed after {MAX_RETRIES} attempts")
+    result['errors'] = [f"Match {match_id}: {error}" for error in result['errors']]
+    return result
+
+
+def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Event",
+                                    compact: bool = False) -> Dict:
     """
     COMPLETE EVENT SCRAPER
     
@@ -206,6 +375,8 @@ def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Even
     Args:
         event_url: DartConnect event URL
         event_name: Human-readable event name
+        compact: Leave match_details out of the main JSON file and write them
+            to a separate .ndjson file, one match per line
         
     Returns:
         Complete results dictionary
@@ -248,109 +419,66 @@ def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Even
         'errors': []
     }
     
-    # Process each match
-    for i, match_url in enumerate(match_urls, 1):
-        match_id = match_url.split('/')[-1]
+    all_players = defaultdict(_new_player_record)
+    
+    # Scrape matches concurrently, keeping each result at its position in
+    # the event so aggregation and output order don't depend on timing
+    match_results = [None] * len(match_urls)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {
+            executor.submit(scrape_match_with_retries, match_url.split('/')[-1]): i
+            for i, match_url in enumerate(match_urls)
+        }
+        for future in as_completed(futures):
+            match_results[futures[future]] = future.result()
+    
+    # Aggregate in event order on the calling thread, so no locking is needed
+    for i, match_result in enumerate(match_results, 1):
+        match_id = match_result['match_id']
         print(f"\n🎯 Match {i}/{len(match_urls)}: {match_id}")
         
-        # Scrape with retries
-        MAX_RETRIES = 3
-        match_result = None
+        if not match_result['success']:
+            results['failed_matches'] += 1
+            results['errors'].extend(match_result['errors'])
+            print(f"  ❌ No data found")
+            continue
         
-        for attempt in range(1, MAX_RETRIES + 1):
-            try:
-                match_result = scrape_single_match_comprehensive(match_id)
-                
-                if match_result['success']:
-                    results['successful_matches'] += 1
-                    results['match_details'].append(match_result)
-                    
-                    # Aggregate player stats
-                    for player in match_result['players']:
-                        player_name = player['name']
-                        if player_name not in results['all_players']:
-                            results['all_players'][player_name] = {
-                                'name': player_name,
-                                'total_matches': 0,
-                                'total_legs': 0,
-                                'total_wins': 0,
-                                'total_darts': 0,
-                                'total_points': 0,
-                                'total_180s': 0,
-                                'total_140_plus': 0,
-                                'total_100_plus': 0,
-                                'total_checkout_opportunities': 0,
-                                'total_checkouts_hit': 0,
-                                'highest_checkout': 0,
-                                'match_details': []
-                            }
-                        
-                        # Add to aggregates
-                        p = results['all_players'][player_name]
-                        p['total_matches'] += 1
-                        p['total_legs'] += player.get('total_games', 0)
-                        p['total_wins'] += player.get('total_wins', 0)
-                        p['total_darts'] += player.get('darts_thrown', 0)
-                        p['total_points'] += int(str(player.get('points_scored', 0)).replace(',', ''))
-                        p['total_180s'] += player.get('count_180s', 0)
-                        p['total_140_plus'] += player.get('count_140_plus', 0)
-                        p['total_100_plus'] += player.get('count_100_plus', 0)
-                        p['total_checkout_opportunities'] += player.get('checkout_opportunities', 0)
-                        p['total_checkouts_hit'] += player.get('checkouts_hit', 0)
-                        
-                        if player.get('highest_checkout'):
-                            p['highest_checkout'] = max(p['highest_checkout'], player.get('highest_checkout', 0))
-                        
-                        # Store match detail
-                        p['match_details'].append({
-                            'match_id': match_id,
-                            'legs': player.get('total_games', 0),
-                            'wins': player.get('total_wins', 0),
-                            'average': player.get('average', 0),
-                            'first_nine_avg': player.get('first_nine_avg'),
-                            'count_180s': player.get('count_180s', 0),
-                            'count_140_plus': player.get('count_140_plus', 0),
-                            'count_100_plus': player.get('count_100_plus', 0)
-                        })
-                    
-                    print(f"  ✅ Success - {len(match_result['players'])} players")
-                    break
-                else:
-                    results['failed_matches'] += 1
-                    results['errors'].extend(match_result['errors'])
-                    print(f"  ❌ No data found")
-                    break
-                    
-            except Exception as e:
-                if attempt < MAX_RETRIES:
-                    print(f"  ⚠️ Attempt {attempt} failed, retrying...")
-                    time.sleep(2)
-                else:
-                    results['failed_matches'] += 1
-                    results['errors'].append(f"Match {match_id}: {str(e)}")
-                    print(f"  ❌ Failed after {MAX_RETRIES} attempts")
-                    break
+        # Validate the whole match before touching the aggregates, so one
+        # bad value only fails this match
+        try:
+            player_rows = _player_rows(match_result)
+        except (TypeError, ValueError) as e:
+            results['failed_matches'] += 1
+            results['errors'].append(f"Match {match_id}: bad player data: {e}")
+            print(f"  ❌ Bad player data: {e}")
+            continue
+        
+        results['successful_matches'] += 1
+        results['match_details'].append(match_result)
+        
+        # Aggregate player stats
+        for player_name, sums, points, highest_checkout, detail in player_rows:
+            p = all_players[player_name]
+            p['name'] = player_name
+            p['total_matches'] += 1
+            for (dst, _), value in zip(_AGG_KEYS, sums):
+                p[dst] += value
+            p['total_points'] += points
+            if highest_checkout > p['highest_checkout']:
+                p['highest_checkout'] = highest_checkout
+            p['match_details'].append(detail)
         
-        # Delay between matches
-        if i < len(match_urls):
-            time.sleep(1.5)
+        print(f"  ✅ Success - {len(match_result['players'])} players")
+    
+    results['all_players'] = dict(all_players)
     
     # Calculate final stats for each player
-    for player_name, player_data in results['all_players'].items():
-        if player_data['total_darts'] > 0:
-            player_data['overall_average'] = round(player_data['total_points'] / player_data['total_darts'] * 3, 2)
-        else:
-            player_data['overall_average'] = 0
-            
-        if player_data['total_legs'] > 0:
-            player_data['win_percentage'] = round((player_data['total_wins'] / player_data['total_legs']) * 100, 1)
-        else:
-            player_data['win_percentage'] = 0
-            
-        if player_data['total_checkout_opportunities'] > 0:
-            player_data['checkout_percentage'] = round((player_data['total_checkouts_hit'] / player_data['total_checkout_opportunities']) * 100, 1)
-        else:
-            player_data['checkout_percentage'] = 0
+    for player_data in results['all_players'].values():
+        player_data['overall_average'] = _safe_ratio(player_data['total_points'], player_data['total_darts'], 3, 2)
+        player_data['win_percentage'] = _safe_ratio(player_data['total_wins'], player_data['total_legs'], 100, 1)
+        player_data['checkout_percentage'] = _safe_ratio(
+            player_data['total_checkouts_hit'], player_data['total_checkout_opportunities'], 100, 1
+        )
     
     results['success'] = results['successful_matches'] > 0
     
@@ -358,8 +486,18 @@ def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Even
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f"event_scrape_results_{timestamp}.json"
     
-    with open(filename, 'w') as f:
-        json.dump(results, f, indent=2)
+    if compact:
+        summary = {k: v for k, v in results.items() if k != 'match_details'}
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+        
+        details_filename = f"{filename[:-len('.json')]}.ndjson"
+        with open(details_filename, 'wb') as f:
+            for match_detail in results['match_details']:
+                f.write(orjson.dumps(match_detail, option=orjson.OPT_APPEND_NEWLINE))
+    else:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
     
     print("\n" + "="*80)
     print(f"🎉 SCRAPE COMPLETE!")
@@ -367,6 +505,8 @@ def scrape_full_event_comprehensive(event_url: str, event_name: str = "AADS Even
     print(f"❌ Failed matches: {results['failed_matches']}")
     print(f"👥 Total players: {len(results['all_players'])}")
     print(f"💾 Results saved to: {filename}")
+    if compact:
+        print(f"💾 Match details saved to: {details_filename}")
     print("="*80)
     
     return results
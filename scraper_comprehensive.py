@@ -5,10 +5,62 @@ Uses direct HTTP requests to DartConnect's /players/ and /counts/ endpoints
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import html
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from datetime import timedelta
+from urllib3.util import Retry
+import lxml.html
+import orjson
+import re
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from scraper import unescape_data_page
+
+
+# Shared keep-alive session: both tabs of a match (and every match in a loop)
+# reuse pooled connections to recap.dartconnect.com. Recaps of finished
+# matches don't change, so responses are cached on disk for 30 days (in this
+# module's own file, so other scrapers' expiry policies don't mix with it).
+_SESSION = CachedSession(
+    'dartconnect_cache_comprehensive.sqlite',
+    backend='sqlite',
+    expire_after=timedelta(days=30)
+)
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+
+# Inertia.js page JSON, HTML-encoded in <div id="app" data-page="...">
+_DATA_PAGE_RE = re.compile(rb'<div[^>]*id="app"[^>]*data-page="([^"]+)"', re.IGNORECASE)
+
+
+def _find_data_page(html_bytes: bytes) -> Optional[str]:
+    """
+    Decoded Inertia.js data-page JSON text from a raw page, or None.
+    A regex over the bytes handles the normal case; lxml is only used if
+    the attribute isn't where the regex expects it.
+    """
+    match = _DATA_PAGE_RE.search(html_bytes)
+    if match:
+        return unescape_data_page(match.group(1).decode('utf-8'))
+    
+    # Fallback: id lookup on the parsed tree; lxml already decodes entities
+    # in attribute values
+    app_div = lxml.html.fromstring(html_bytes).get_element_by_id('app', None)
+    if app_div is None:
+        return None
+    return app_div.get('data-page')
+
+
+def get_session() -> requests.Session:
+    """Return the shared pooled session, for callers scraping many matches"""
+    return _SESSION
 
 
 def scrape_match_comprehensive(match_id: str) -> Dict:
@@ -38,39 +90,50 @@ def scrape_match_comprehensive(match_id: str) -> Dict:
     }
     
     try:
-        # Fetch Player Performance tab
+        # Both tabs are independent, so request them concurrently: the
+        # match costs one round-trip instead of two
         print(f"Fetching Player Performance: {players_url}")
-        response_players = requests.get(players_url, timeout=10)
+        print(f"Fetching Match Counts: {counts_url}")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            players_future = executor.submit(_SESSION.get, players_url, timeout=10)
+            counts_future = executor.submit(_SESSION.get, counts_url, timeout=10)
+            response_players = players_future.result()
+            response_counts = counts_future.result()
+        
         response_players.raise_for_status()
         
-        soup_players = BeautifulSoup(response_players.text, 'html.parser')
-        app_div_players = soup_players.find('div', {'id': 'app'})
+        data_page_players = _find_data_page(response_players.content)
         
-        if not app_div_players or 'data-page' not in app_div_players.attrs:
+        if data_page_players is None:
             result['errors'].append("Could not find Inertia.js data in Player Performance tab")
             return result
         
-        page_data_players = json.loads(html.unescape(app_div_players['data-page']))
+        page_data_players = orjson.loads(data_page_players)
         players_data = page_data_players.get('props', {}).get('players', [])
         
-        # Fetch Match Counts tab
-        print(f"Fetching Match Counts: {counts_url}")
-        response_counts = requests.get(counts_url, timeout=10)
+        # Match Counts tab
         response_counts.raise_for_status()
         
-        soup_counts = BeautifulSoup(response_counts.text, 'html.parser')
-        app_div_counts = soup_counts.find('div', {'id': 'app'})
+        data_page_counts = _find_data_page(response_counts.content)
         
-        if not app_div_counts or 'data-page' not in app_div_counts.attrs:
+        if data_page_counts is None:
             result['errors'].append("Could not find Inertia.js data in Match Counts tab")
             return result
         
-        page_data_counts = json.loads(html.unescape(app_div_counts['data-page']))
+        page_data_counts = orjson.loads(data_page_counts)
         performances = page_data_counts.get('props', {}).get('playerPerformances', [])
         match_info = page_data_counts.get('props', {}).get('matchInfo', {})
         
+        # Index the Match Counts entries by player name (the 'name' field, as
+        # on the Player Performance tab) so each player gets their own stats
+        # even if the two tabs list players in a different order
+        perf_by_name = {
+            (perf.get('name') or '').strip().lower(): perf
+            for perf in performances
+        }
+        
         # Combine data from both tabs
-        for i, player in enumerate(players_data):
+        for player in players_data:
             player_stats = {
                 'name': player.get('name'),
                 'total_games': player.get('total_games'),
@@ -83,20 +146,25 @@ def scrape_match_comprehensive(match_id: str) -> Dict:
             }
             
             # Add advanced stats from Match Counts tab if available
-            if i < len(performances):
-                perf = performances[i]
+            perf = perf_by_name.get((player.get('name') or '').strip().lower())
+            if perf is None:
+                result['errors'].append(f"No Match Counts entry for player {player.get('name')!r}")
+                print(f"⚠️ No Match Counts entry for {player.get('name')!r}")
+            else:
                 dist = perf.get('dist', {})
                 plus_100 = dist.get('plus_100', {})
                 do_stats = perf.get('double_out_stats', {})
                 
+                count_180s, count_140_plus = _hi_scores(plus_100)
+                
                 player_stats.update({
                     'first_nine_avg': perf.get('first_nine'),
                     'avg_finish': perf.get('avg_finish'),
                     
                     # High Scores
-                    'count_180s': 0 if plus_100.get('180') == '-' else int(plus_100.get('180', 0)),
-                    'count_140_plus': _calculate_140_plus(plus_100),
-                    'count_100_plus': plus_100.get('count', 0),
+                    'count_180s': count_180s,
+                    'count_140_plus': count_140_plus,
+                    'count_100_plus': _to_count(plus_100.get('count')),
                     'highest_score': plus_100.get('highest'),
                     
                     # Checkout Stats
@@ -122,7 +190,7 @@ def scrape_match_comprehensive(match_id: str) -> Dict:
         
     except requests.RequestException as e:
         result['errors'].append(f"Request error: {str(e)}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         result['errors'].append(f"JSON parsing error: {str(e)}")
     except Exception as e:
         result['errors'].append(f"Unexpected error: {str(e)}")
@@ -130,26 +198,37 @@ def scrape_match_comprehensive(match_id: str) -> Dict:
     return result
 
 
-def _calculate_140_plus(plus_100: Dict) -> int:
-    """Calculate total 140+ scores from distribution data"""
-    count = 0
-    
-    # 140-159 range
-    val = plus_100.get('140_159', '-')
-    if val != '-':
-        count += int(val)
-    
-    # 160-179 range
-    val = plus_100.get('160_179', '-')
-    if val != '-':
-        count += int(val)
-    
-    # 180s
-    val = plus_100.get('180', '-')
-    if val != '-':
-        count += int(val)
+def scrape_matches(match_ids: List[str], max_workers: int = 5) -> List[Dict]:
+    """
+    Scrape many matches concurrently over the shared session
+
+    Each match already fetches its two tabs in parallel, so max_workers=5
+    keeps at most 10 requests in flight - the size of the session's
+    connection pool.
+
+    Returns:
+        One result dict per match ID, in the same order as match_ids
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(scrape_match_comprehensive, match_ids))
+
+
+def _hi_scores(plus_100: Dict) -> Tuple[int, int]:
+    """
+    Read the 180 and 140+ counts from distribution data in one pass.
+    '-' means none in that bucket.
     
-    return count
+    Returns:
+        (count_180s, count_140_plus), where 140+ includes the 180s
+    """
+    get = plus_100.get
+    count_180s = _to_count(get('180'))
+    return count_180s, count_180s + _to_count(get('140_159')) + _to_count(get('160_179'))
+
+
+def _to_count(val) -> int:
+    """Convert a distribution count to int; '-', None and '' mean none"""
+    return 0 if val in ('-', None, '') else int(val)
 
 
 def print_match_stats(match_data: Dict):
@@ -179,8 +258,9 @@ def print_match_stats(match_data: Dict):
     print(f"PLAYER STATISTICS ({len(match_data['players'])} players)")
     print(f"{'='*80}")
     
+    winner_index = (match_data.get('match_info') or {}).get('winner_index')
     for i, player in enumerate(match_data['players']):
-        is_winner = (i == match_data.get('match_info', {}).get('winner_index'))
+        is_winner = (i == winner_index)
         winner_mark = " 🏆" if is_winner else ""
         
         print(f"\n{'─'*80}")
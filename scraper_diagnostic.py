@@ -5,17 +5,30 @@ and customize the scraper accordingly.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString
 import json
+import lxml.html
+import re
 from typing import Dict, List
 
 
-def inspect_dartconnect_page(url: str):
+# One session for every fetch the diagnostic makes
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+})
+
+# Leaf td/span/div elements whose text contains a digit
+NUMERIC_CELL_RE = re.compile(rb'<(td|span|div)[^>]*>([^<]*\d[^<]*)</\1>')
+
+
+def inspect_dartconnect_page(url: str, prettify: bool = False):
     """
     Fetch and analyze a DartConnect Match Recap page structure.
     
     Args:
         url: DartConnect Match Recap URL
+        prettify: Save an indented copy of the page instead of the raw HTML
     """
     print("="*80)
     print("DARTCONNECT PAGE INSPECTOR")
@@ -24,13 +37,10 @@ def inspect_dartconnect_page(url: str):
     
     try:
         # Fetch the page
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         print("✅ Page fetched successfully!\n")
         
@@ -77,14 +87,16 @@ def inspect_dartconnect_page(url: str):
         # 3. Find potential player names
         print(f"\n3. POTENTIAL PLAYER DATA:")
         
-        # Look for text that might be player names (longer text, capitalized)
-        all_text = soup.find_all(string=True)
+        # Look for text that might be player names (longer text, capitalized).
+        # One walk over the tree; each text node's parent is just .parent
         potential_names = []
-        for text in all_text:
-            text = text.strip()
-            if len(text) > 3 and len(text) < 50 and any(c.isupper() for c in text):
-                parent = text.find_parent()
-                if parent and parent.name not in ['script', 'style', 'meta', 'link']:
+        for node in soup.descendants:
+            if not isinstance(node, NavigableString):
+                continue
+            text = node.strip()
+            if 3 < len(text) < 50 and any(c.isupper() for c in text):
+                parent = node.parent
+                if parent and parent.name not in ('script', 'style', 'meta', 'link'):
                     potential_names.append({
                         'text': text,
                         'tag': parent.name,
@@ -102,18 +114,17 @@ def inspect_dartconnect_page(url: str):
         
         # 4. Find numeric data (stats)
         print(f"\n4. NUMERIC DATA PATTERNS:")
-        numeric_cells = soup.find_all(['td', 'span', 'div'], string=lambda x: x and any(c.isdigit() for c in x) if x else False)
+        # A regex pass over the raw bytes is plenty for a sample
+        numeric_cells = NUMERIC_CELL_RE.findall(response.content)
         
-        # Group by parent structure
+        # Group by tag
         stat_patterns = {}
-        for cell in numeric_cells[:30]:  # Sample first 30
-            text = cell.get_text(strip=True)
-            parent = cell.parent
-            parent_key = f"{parent.name}[{parent.get('class', ['no-class'])}]"
+        for tag, text in numeric_cells[:30]:  # Sample first 30
+            tag_key = tag.decode('ascii')
             
-            if parent_key not in stat_patterns:
-                stat_patterns[parent_key] = []
-            stat_patterns[parent_key].append(text)
+            if tag_key not in stat_patterns:
+                stat_patterns[tag_key] = []
+            stat_patterns[tag_key].append(text.decode('utf-8', errors='replace').strip())
         
         for pattern, values in list(stat_patterns.items())[:5]:
             print(f"   {pattern}: {values[:5]}")
@@ -121,9 +132,13 @@ def inspect_dartconnect_page(url: str):
         # 5. Export raw HTML structure
         print(f"\n5. EXPORTING HTML SAMPLE...")
         
-        # Save a cleaned version of the page
-        with open('dartconnect_page_sample.html', 'w', encoding='utf-8') as f:
-            f.write(soup.prettify())
+        # Save the page as served, or re-indented by lxml if asked
+        page_bytes = response.content
+        if prettify:
+            page_bytes = lxml.html.tostring(lxml.html.fromstring(page_bytes),
+                                            pretty_print=True, encoding='utf-8')
+        with open('dartconnect_page_sample.html', 'wb') as f:
+            f.write(page_bytes)
         print("   ✅ Saved to: dartconnect_page_sample.html")
         
         # 6. Generate scraper hints
@@ -204,11 +219,8 @@ def generate_scraper_template(url: str):
     print("="*80)
     
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        response = _SESSION.get(url, timeout=10)
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Find the most promising table
         tables = soup.find_all('table')
@@ -283,23 +295,27 @@ if __name__ == "__main__":
         print("DartConnect Scraper Diagnostic Tool")
         print("\nUsage:")
         print("  python scraper_diagnostic.py inspect <URL>    - Analyze page structure")
+        print("        [--prettify]                            - Save an indented HTML sample")
         print("  python scraper_diagnostic.py test <URL>       - Test current scraper")
         print("  python scraper_diagnostic.py template <URL>   - Generate scraper template")
         print("\nExample:")
         print("  python scraper_diagnostic.py inspect https://www.dartconnect.com/game/recap/12345")
         sys.exit(1)
     
-    command = sys.argv[1].lower()
+    prettify = '--prettify' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--prettify']
+    
+    command = args[0].lower() if args else ''
     
-    if len(sys.argv) < 3:
+    if len(args) < 2:
         print("❌ Error: URL required")
         print("Usage: python scraper_diagnostic.py <command> <URL>")
         sys.exit(1)
     
-    url = sys.argv[2]
+    url = args[1]
     
     if command == "inspect":
-        inspect_dartconnect_page(url)
+        inspect_dartconnect_page(url, prettify=prettify)
     elif command == "test":
         test_scraper_with_url(url)
     elif command == "template":
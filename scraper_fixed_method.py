@@ -3,6 +3,20 @@ Updated _parse_alternative_format method for scraper.py
 This replacement handles the actual DartConnect Inertia.js structure
 """
 
+import sys
+
+
+class PStats:
+    """Running totals for one player in _parse_alternative_format"""
+    __slots__ = ('legs_played', 'ppr_sum', 'ppr_count', 'high_finish')
+    
+    def __init__(self):
+        self.legs_played = 0
+        self.ppr_sum = 0.0
+        self.ppr_count = 0
+        self.high_finish = 0
+
+
 def _parse_alternative_format(self, soup):
     """
     Parse DartConnect Recap pages that use Inertia.js with embedded JSON.
@@ -25,11 +39,11 @@ def _parse_alternative_format(self, soup):
         
         # Parse the JSON data (it's HTML-encoded)
         import html
-        import json
+        import orjson
         
         page_data_encoded = app_div['data-page']
         page_data = html.unescape(page_data_encoded)
-        data = json.loads(page_data)
+        data = orjson.loads(page_data)
         
         if 'props' not in data:
             logger.error("No props in Inertia data")
@@ -46,9 +60,41 @@ def _parse_alternative_format(self, soup):
         # Collect statistics per player
         player_stats = {}
         
+        def _accum(side_data):
+            """Add one player's leg (home or away side) to player_stats"""
+            if not side_data or not side_data.get('players'):
+                return
+            
+            # Get player name from players list
+            # (interned: the same few names key every leg of the match)
+            player_name = sys.intern(side_data['players'][0].get('player_label', '').strip())
+            if not player_name:
+                return
+            
+            stats = player_stats.get(player_name)
+            if stats is None:
+                stats = player_stats[player_name] = PStats()
+            
+            # Add leg statistics
+            stats.legs_played += 1
+            
+            # Get PPR (points per round) and convert to 3DA
+            ppr = side_data.get('ppr')
+            if ppr:
+                try:
+                    stats.ppr_sum += float(ppr)
+                    stats.ppr_count += 1
+                except (ValueError, TypeError):
+                    pass
+            
+            # Track high finish (double_out_points)
+            finish = side_data.get('double_out_points', 0)
+            if finish and finish > stats.high_finish:
+                stats.high_finish = finish
+        
         # Process each segment
-        for segment_key, segment_list in segments.items():
-            if not segment_list or len(segment_list) == 0:
+        for segment_list in segments.values():
+            if not segment_list:
                 continue
             
             # segment_list[0] contains the list of legs
@@ -57,102 +103,34 @@ def _parse_alternative_format(self, soup):
             if not isinstance(legs_list, list):
                 continue
             
-            # Process each leg
+            # Process each leg, home and away players alike
             for leg_data in legs_list:
                 if not isinstance(leg_data, dict):
                     continue
                 
-                # Process home player
-                if 'home' in leg_data:
-                    home_data = leg_data['home']
-                    # Get player name from players list
-                    if 'players' in home_data and home_data['players']:
-                        player_name = home_data['players'][0].get('player_label', '').strip()
-                        
-                        if player_name:
-                            if player_name not in player_stats:
-                                player_stats[player_name] = {
-                                    'legs_played': 0,
-                                    'total_ppr': 0.0,
-                                    'ppr_values': [],
-                                    'high_finish': 0
-                                }
-                            
-                            # Add leg statistics
-                            player_stats[player_name]['legs_played'] += 1
-                            
-                            # Get PPR (points per round) and convert to 3DA
-                            ppr = home_data.get('ppr')
-                            if ppr:
-                                try:
-                                    ppr_float = float(ppr)
-                                    player_stats[player_name]['ppr_values'].append(ppr_float)
-                                    player_stats[player_name]['total_ppr'] += ppr_float
-                                except (ValueError, TypeError):
-                                    pass
-                            
-                            # Track high finish (double_out_points)
-                            finish = home_data.get('double_out_points', 0)
-                            if finish and finish > player_stats[player_name]['high_finish']:
-                                player_stats[player_name]['high_finish'] = finish
-                
-                # Process away player
-                if 'away' in leg_data:
-                    away_data = leg_data['away']
-                    # Get player name from players list
-                    if 'players' in away_data and away_data['players']:
-                        player_name = away_data['players'][0].get('player_label', '').strip()
-                        
-                        if player_name:
-                            if player_name not in player_stats:
-                                player_stats[player_name] = {
-                                    'legs_played': 0,
-                                    'total_ppr': 0.0,
-                                    'ppr_values': [],
-                                    'high_finish': 0
-                                }
-                            
-                            # Add leg statistics
-                            player_stats[player_name]['legs_played'] += 1
-                            
-                            # Get PPR and convert to 3DA
-                            ppr = away_data.get('ppr')
-                            if ppr:
-                                try:
-                                    ppr_float = float(ppr)
-                                    player_stats[player_name]['ppr_values'].append(ppr_float)
-                                    player_stats[player_name]['total_ppr'] += ppr_float
-                                except (ValueError, TypeError):
-                                    pass
-                            
-                            # Track high finish
-                            finish = away_data.get('double_out_points', 0)
-                            if finish and finish > player_stats[player_name]['high_finish']:
-                                player_stats[player_name]['high_finish'] = finish
+                _accum(leg_data.get('home'))
+                _accum(leg_data.get('away'))
         
         # Convert to list format with calculated averages
         for player_name, stats in player_stats.items():
             # Calculate average PPR (which is basically the 3-dart average)
-            if stats['ppr_values']:
-                avg_ppr = sum(stats['ppr_values']) / len(stats['ppr_values'])
-            else:
-                avg_ppr = 0.0
+            avg_ppr = stats.ppr_sum / stats.ppr_count if stats.ppr_count else 0.0
             
             player_dict = {
                 "player_name": player_name,
                 "three_dart_avg": avg_ppr,  # PPR in DartConnect is essentially the 3DA
-                "legs_played": stats['legs_played'],
+                "legs_played": stats.legs_played,
                 "first_9_avg": avg_ppr,  # Use same as 3DA for now
                 "hundreds_plus": 0,  # Not available in current data structure
                 "one_forty_plus": 0,  # Not available
                 "one_eighties": 0,  # Not available
-                "high_finish": stats['high_finish']
+                "high_finish": stats.high_finish
             }
             players.append(player_dict)
         
         logger.info(f"Parsed {len(players)} players from Inertia.js data")
         
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Failed to parse JSON data from data-page: {e}")
     except Exception as e:
         logger.error(f"Error parsing alternative format: {e}", exc_info=True)
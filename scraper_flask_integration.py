@@ -4,12 +4,16 @@ This version integrates the working scraper logic with Flask progress tracking
 and saves data to JSON instead of uploading to Supabase to avoid 400 errors
 """
 
-import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry
 import json
+import orjson
 import logging
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -18,6 +22,33 @@ logger = logging.getLogger(__name__)
 # In-memory progress tracking (same as Flask app)
 scrape_progress = {}
 
+# Matches scraped at once per event (each match makes two requests)
+MAX_WORKERS = 8
+
+# Side pool for the Match Counts fetch of each match. It is kept separate from
+# the per-match pool so a match worker never waits on its own pool.
+_TAB_POOL = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+# Shared keep-alive session for tv.dartconnect.com and recap.dartconnect.com,
+# so the ~27 matches of an event reuse connections instead of re-handshaking.
+# Completed match tabs don't change, so responses are cached on disk; the
+# API2 match list (a POST) is only kept for an hour so new matches show up.
+# The cache file is shared only with scraper_html_parser (same policy).
+_SESSION = CachedSession(
+    'dartconnect_cache_event.sqlite',
+    backend='sqlite',
+    expire_after=timedelta(days=7),
+    urls_expire_after={'tv.dartconnect.com/api2/*': 3600},
+    allowable_methods=('GET', 'POST'),
+    cache_control=True
+)
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
 def update_progress(job_id, current_match, total_matches, status, stats=None):
     """Update progress for a scraping job"""
     scrape_progress[job_id] = {
@@ -29,7 +60,7 @@ def update_progress(job_id, current_match, total_matches, status, stats=None):
     }
     logger.info(f"[{job_id}] {status} - Match {current_match}/{total_matches}")
 
-def extract_match_urls_from_event(event_url, job_id):
+def extract_match_urls_from_event(event_url, job_id, refresh=False):
     """Extract all match URLs from an event using DartConnect API2"""
     try:
         update_progress(job_id, 0, 27, f"Extracting match URLs from: {event_url}")
@@ -48,14 +79,12 @@ def extract_match_urls_from_event(event_url, job_id):
         logger.info(f"[{job_id}] Calling API2: {api_url}")
         
         headers = {
-            'Content-Type': 'application/json',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'application/json',
             'Referer': event_url
         }
         
-        # Make POST request like working scraper
-        response = requests.post(api_url, headers=headers, json={}, timeout=10)
+        # Make POST request like working scraper (json= sets Content-Type)
+        response = _SESSION.post(api_url, headers=headers, json={}, timeout=10, force_refresh=refresh)
         response.raise_for_status()
         
         data = response.json()
@@ -77,10 +106,12 @@ def extract_match_urls_from_event(event_url, job_id):
         update_progress(job_id, 0, 0, f"Error: Failed to extract match URLs - {str(e)}")
         return []
 
-def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matches):
+def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matches, refresh=False):
     """Scrape comprehensive stats from a single match"""
     try:
-        update_progress(job_id, match_index, total_matches, f"Match {match_index}/{total_matches}")
+        # Progress is reported by the caller as matches complete; several
+        # matches run at once, so only log the start here
+        logger.info(f"[{job_id}] Match {match_index}/{total_matches}: {match_url}")
         
         # Get match ID from URL
         match_id = match_url.split('/')[-1]
@@ -90,21 +121,29 @@ def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matc
         counts_url = f"https://recap.dartconnect.com/counts/{match_id}"
         
         headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Referer': match_url
         }
         
-        logger.info(f"Fetching Player Performance: {players_url}")
-        players_response = requests.get(players_url, headers=headers, timeout=30)
-        players_response.raise_for_status()
-        
+        # Fetch Match Counts in the background while this thread fetches
+        # Player Performance, so the two round-trips overlap
         logger.info(f"Fetching Match Counts: {counts_url}")
-        counts_response = requests.get(counts_url, headers=headers, timeout=30)
-        counts_response.raise_for_status()
+        counts_future = _TAB_POOL.submit(_SESSION.get, counts_url, headers=headers, timeout=30,
+                                       force_refresh=refresh)
         
-        players_data = players_response.json()
-        counts_data = counts_response.json()
+        logger.info(f"Fetching Player Performance: {players_url}")
+        with _SESSION.get(players_url, headers=headers, timeout=30,
+                          force_refresh=refresh) as players_response, \
+                counts_future.result() as counts_response:
+            players_response.raise_for_status()
+            counts_response.raise_for_status()
+            players_data = orjson.loads(players_response.content)
+            counts_data = orjson.loads(counts_response.content)
+        
+        # Index the counts entries by player name (first entry wins)
+        counts_by_name = {}
+        for counts in counts_data.get('players', []):
+            counts_by_name.setdefault(counts.get('name'), counts)
         
         # Process the data
         match_players = []
@@ -113,46 +152,72 @@ def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matc
             player_name = player_data.get('name', '')
             
             # Get counts for this player
-            player_counts = next((c for c in counts_data.get('players', []) if c.get('name') == player_name), {})
+            player_counts = counts_by_name.get(player_name, {})
             
-            # Calculate comprehensive stats
+            # Calculate comprehensive stats in one pass over the legs
             legs = player_data.get('legs', [])
-            total_darts = sum(leg.get('darts', 0) for leg in legs)
-            total_score = sum(leg.get('score', 0) for leg in legs)
-            
-            # 3-dart average
-            three_dart_avg = (total_score / total_darts * 3) if total_darts > 0 else 0
-            
-            # First 9 average from first 3 darts of each leg
-            first_9_scores = []
-            for leg in legs:
-                throws = leg.get('throws', [])
-                if throws:
-                    first_throw = throws[0] if len(throws) > 0 else 0
-                    first_9_scores.append(first_throw)
-            first_9_avg = sum(first_9_scores) if first_9_scores else 0
-            
-            # Checkout stats
-            legs_won = len([leg for leg in legs if leg.get('won', False)])
             legs_played = len(legs)
-            legs_lost = legs_played - legs_won
             
+            total_darts = 0
+            total_score = 0
+            first_9_avg = 0
+            legs_won = 0
             checkout_attempts = 0
             successful_checkouts = 0
             checkout_total = 0
             high_finish = 0
+            checkout_100_plus = 0
+            checkout_170 = 0
+            legs_detail = []
             
-            for leg in legs:
-                if leg.get('won', False):
-                    checkout_score = leg.get('checkout', 0)
-                    if checkout_score > 0:
+            for i, leg in enumerate(legs):
+                get = leg.get
+                darts = get('darts', 0)
+                score = get('score', 0)
+                won = get('won', False)
+                checkout = get('checkout', 0)
+                
+                total_darts += darts
+                total_score += score
+                
+                # First 9 average from the first throw of each leg
+                throws = get('throws')
+                if throws:
+                    first_9_avg += throws[0]
+                
+                # Checkout stats
+                if won:
+                    legs_won += 1
+                    if checkout > 0:
                         successful_checkouts += 1
-                        checkout_total += checkout_score
-                        high_finish = max(high_finish, checkout_score)
+                        checkout_total += checkout
+                        if checkout > high_finish:
+                            high_finish = checkout
                 
                 # Count checkout attempts (legs where player got below 170)
-                if leg.get('ending_points', 501) < 170:
+                if get('ending_points', 501) < 170:
                     checkout_attempts += 1
+                
+                # Checkout categories
+                if checkout >= 100:
+                    checkout_100_plus += 1
+                    if checkout == 170:
+                        checkout_170 += 1
+                
+                legs_detail.append({
+                    'leg_number': i + 1,
+                    'ppr': (score / darts * 3) if darts > 0 else 0,
+                    'starting_points': 501,  # Standard 501 game
+                    'ending_points': get('ending_points', 0),
+                    'checkout': checkout,
+                    'won': won,
+                    'darts_thrown': darts
+                })
+            
+            legs_lost = legs_played - legs_won
+            
+            # 3-dart average
+            three_dart_avg = (total_score / total_darts * 3) if total_darts > 0 else 0
             
             checkout_average = (checkout_total / successful_checkouts) if successful_checkouts > 0 else 0
             checkout_success_rate = (successful_checkouts / checkout_attempts) if checkout_attempts > 0 else 0
@@ -162,23 +227,6 @@ def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matc
             one_forty_plus = player_counts.get('140_plus', 0) or player_counts.get('140_plus_count', 0)
             hundreds_plus = player_counts.get('100_plus', 0) or player_counts.get('100_plus_count', 0)
             
-            # Checkout categories
-            checkout_100_plus = len([leg for leg in legs if leg.get('checkout', 0) >= 100])
-            checkout_170 = len([leg for leg in legs if leg.get('checkout', 0) == 170])
-            
-            # Process leg details
-            legs_detail = []
-            for i, leg in enumerate(legs):
-                legs_detail.append({
-                    'leg_number': i + 1,
-                    'ppr': (leg.get('score', 0) / leg.get('darts', 1) * 3) if leg.get('darts', 0) > 0 else 0,
-                    'starting_points': 501,  # Standard 501 game
-                    'ending_points': leg.get('ending_points', 0),
-                    'checkout': leg.get('checkout', 0),
-                    'won': leg.get('won', False),
-                    'darts_thrown': leg.get('darts', 0)
-                })
-            
             player_stats = {
                 'player_name': player_name,
                 'three_dart_avg': round(three_dart_avg, 2),
@@ -214,25 +262,39 @@ def scrape_single_match_comprehensive(match_url, job_id, match_index, total_matc
         logger.error(f"[{job_id}] Error scraping match {match_url}: {e}")
         return None
 
-def scrape_full_event_comprehensive_flask(event_url, job_id):
-    """Complete event scraping with Flask progress integration"""
+def scrape_full_event_comprehensive_flask(event_url, job_id, refresh=False):
+    """
+    Complete event scraping with Flask progress integration
+    
+    refresh=True re-fetches every page instead of reading the HTTP cache
+    (the fresh responses replace the cached ones). It only applies to this
+    job's requests; other jobs sharing the session are unaffected.
+    """
     try:
         # Extract all match URLs
-        match_urls = extract_match_urls_from_event(event_url, job_id)
+        match_urls = extract_match_urls_from_event(event_url, job_id, refresh)
         if not match_urls:
             update_progress(job_id, 0, 0, "Error: No matches found")
             return
         
         update_progress(job_id, 0, len(match_urls), f"Scraping {len(match_urls)} matches with comprehensive stats")
         
-        all_results = []
-        successful_scrapes = 0
+        # Matches are independent and the work is network-bound, so scrape
+        # several at once over the shared session; results keep event order
+        total_matches = len(match_urls)
+        results = [None] * total_matches
         
-        for i, match_url in enumerate(match_urls, 1):
-            result = scrape_single_match_comprehensive(match_url, job_id, i, len(match_urls))
-            if result:
-                all_results.append(result)
-                successful_scrapes += 1
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(scrape_single_match_comprehensive, match_url, job_id, i, total_matches, refresh): i
+                for i, match_url in enumerate(match_urls, 1)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future] - 1] = future.result()
+                update_progress(job_id, done, total_matches, f"Match {done}/{total_matches}")
+        
+        all_results = [result for result in results if result]
+        successful_scrapes = len(all_results)
         
         # Save results to JSON file
         output_file = f"flask_scrape_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -248,19 +310,16 @@ def scrape_full_event_comprehensive_flask(event_url, job_id):
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(summary, f, indent=2, ensure_ascii=False)
         
-        # Calculate aggregated stats
-        total_players = sum(len(match['players']) for match in all_results)
-        avg_score = sum(
-            player['three_dart_avg'] 
-            for match in all_results 
-            for player in match['players']
-        ) / total_players if total_players > 0 else 0
-        
-        total_180s = sum(
-            player['one_eighties'] 
-            for match in all_results 
-            for player in match['players']
-        )
+        # Calculate aggregated stats in one pass over every player
+        total_players = 0
+        score_sum = 0
+        total_180s = 0
+        for match in all_results:
+            for player in match['players']:
+                total_players += 1
+                score_sum += player['three_dart_avg']
+                total_180s += player['one_eighties']
+        avg_score = score_sum / total_players if total_players > 0 else 0
         
         final_stats = {
             'total_players': total_players,
@@ -279,7 +338,7 @@ def scrape_full_event_comprehensive_flask(event_url, job_id):
         logger.error(f"[{job_id}] Fatal error in scraping: {e}")
         update_progress(job_id, 0, 0, f"Error: {str(e)}")
 
-def start_background_scrape(event_url):
+def start_background_scrape(event_url, refresh=False):
     """Start a background scrape with progress tracking"""
     # Generate job ID from timestamp and event URL
     timestamp = int(time.time())
@@ -288,7 +347,7 @@ def start_background_scrape(event_url):
     # Start scraping in background thread
     thread = threading.Thread(
         target=scrape_full_event_comprehensive_flask, 
-        args=(event_url, job_id)
+        args=(event_url, job_id, refresh)
     )
     thread.daemon = True
     thread.start()
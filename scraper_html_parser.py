@@ -4,14 +4,39 @@ Updated DartConnect Scraper - HTML Parser Version
 Handles the new DartConnect API that returns HTML with embedded JSON data
 """
 
-import requests
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util import Retry
 import json
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 import html
 
-def extract_match_urls_from_event(event_url):
+# Shared keep-alive session: the API2 call and every match's two tabs reuse
+# pooled connections instead of opening a new TLS connection per request.
+# Responses are cached on disk (the API2 match list only for an hour), in a
+# file shared only with scraper_flask_integration, which uses the same policy.
+_SESSION = CachedSession(
+    'dartconnect_cache_event.sqlite',
+    backend='sqlite',
+    expire_after=timedelta(days=7),
+    urls_expire_after={'tv.dartconnect.com/api2/*': 3600},
+    allowable_methods=('GET', 'POST'),
+    cache_control=True
+)
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+# Background thread for each match's counts tab fetch
+_TAB_POOL = ThreadPoolExecutor(max_workers=4)
+
+def extract_match_urls_from_event(event_url, refresh=False):
     """
     Extract match URLs from an event using the DartConnect API2 endpoint
     """
@@ -31,14 +56,12 @@ def extract_match_urls_from_event(event_url):
     api_url = f"https://tv.dartconnect.com/api2/event/{event_id}/matches"
     
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/json, text/plain, */*',
-        'Content-Type': 'application/json'
+        'Accept': 'application/json, text/plain, */*'
     }
     
     try:
         print(f"🔗 Fetching from API: {api_url}")
-        response = requests.post(api_url, headers=headers, json={})
+        response = _SESSION.post(api_url, headers=headers, json={}, force_refresh=refresh)
         response.raise_for_status()
         
         api_data = response.json()
@@ -108,21 +131,25 @@ def parse_html_data_page(html_content):
         print(f"❌ Error parsing HTML data-page: {str(e)}")
         return None
 
-def scrape_single_match_comprehensive(match_url):
+def scrape_single_match_comprehensive(match_url, refresh=False):
     """
     Scrape comprehensive data from a single match URL by parsing HTML data
     """
     print(f"🎯 Scraping match: {match_url}")
     
     headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
     }
     
+    # Counts tab lives next to the players tab
+    counts_url = match_url.replace('/players/', '/counts/')
+    
     try:
-        # Get players data
-        print(f"  📊 Fetching player data...")
-        response = requests.get(match_url, headers=headers)
+        # Get counts data in the background while players data is fetched,
+        # so the match costs one round-trip instead of two
+        print(f"  📊 Fetching player and counts data...")
+        counts_future = _TAB_POOL.submit(_SESSION.get, counts_url, headers=headers, force_refresh=refresh)
+        response = _SESSION.get(match_url, headers=headers, force_refresh=refresh)
         response.raise_for_status()
         
         # Parse HTML data
@@ -143,10 +170,7 @@ def scrape_single_match_comprehensive(match_url):
         print(f"  ✅ Found match: {match_info.get('competition_title', 'Unknown')} - {match_info.get('event_title', 'Unknown')}")
         
         # Get counts data
-        counts_url = match_url.replace('/players/', '/counts/')
-        print(f"  📈 Fetching counts data...")
-        
-        counts_response = requests.get(counts_url, headers=headers)
+        counts_response = counts_future.result()
         counts_response.raise_for_status()
         
         counts_page_data = parse_html_data_page(counts_response.text)
@@ -233,15 +257,19 @@ def scrape_single_match_comprehensive(match_url):
         print(f"  ❌ Error scraping match: {str(e)}")
         return None
 
-def scrape_event_comprehensive(event_url):
+def scrape_event_comprehensive(event_url, refresh=False):
     """
     Scrape all matches from an event URL and return comprehensive data
+    
+    refresh=True re-fetches every page instead of reading the HTTP cache
+    (the fresh responses replace the cached ones). It only applies to this
+    call's requests, not to other callers sharing the session.
     """
     print(f"\n🚀 Starting comprehensive event scraping...")
     print(f"🎯 Event URL: {event_url}")
     
     # Step 1: Extract match URLs
-    match_urls = extract_match_urls_from_event(event_url)
+    match_urls = extract_match_urls_from_event(event_url, refresh)
     if not match_urls:
         print("❌ No match URLs found")
         return None
@@ -255,7 +283,7 @@ def scrape_event_comprehensive(event_url):
     for i, match_url in enumerate(match_urls, 1):
         print(f"\n🔄 Processing match {i}/{len(match_urls)}")
         
-        match_data = scrape_single_match_comprehensive(match_url)
+        match_data = scrape_single_match_comprehensive(match_url, refresh)
         if match_data:
             all_matches.append(match_data)
             successful_matches += 1
@@ -94,7 +94,7 @@ def scrape_match_stats(match_url: str) -> Dict:
         response.raise_for_status()
         
         # Parse HTML and extract JSON data
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         app_div = soup.find('div', {'id': 'app'})
         
         if not app_div or 'data-page' not in app_div.attrs:
@@ -129,7 +129,7 @@ def scrape_match_stats(match_url: str) -> Dict:
             counts_response = requests.get(counts_url, timeout=10)
             counts_response.raise_for_status()
             
-            counts_soup = BeautifulSoup(counts_response.text, 'html.parser')
+            counts_soup = BeautifulSoup(counts_response.content, 'lxml')
             counts_app_div = counts_soup.find('div', {'id': 'app'})
             
             if counts_app_div and 'data-page' in counts_app_div.attrs:
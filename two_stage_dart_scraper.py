@@ -17,6 +17,7 @@ import json
 import re
 import time
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 from datetime import datetime
 import logging
 
@@ -70,7 +71,7 @@ class TwoStageDartScraper:
             response.raise_for_status()
             
             data = response.json()
-            logger.info(f"✅ API response received")
+            logger.info("✅ API response received")
             
             # Extract match URLs from response
             match_urls = []
@@ -164,7 +165,7 @@ class TwoStageDartScraper:
             if result['success']:
                 logger.info(f"    ✅ Extracted {len(result['players'])} players")
             else:
-                logger.info(f"    ❌ No players found")
+                logger.info("    ❌ No players found")
                 result['errors'].append("No players found")
             
             return result
@@ -318,7 +319,7 @@ class TwoStageDartScraper:
                     events = props['tournamentEvents']
                     self._parse_bracket_results(events, bracket_info)
             
-            logger.info(f"✅ Tournament bracket extracted")
+            logger.info("✅ Tournament bracket extracted")
             return bracket_info
             
         except Exception as e:
@@ -393,7 +394,7 @@ class TwoStageDartScraper:
         Returns:
             Pandas DataFrame with all player statistics
         """
-        logger.info(f"🚀 STARTING TWO-STAGE DART SCRAPER")
+        logger.info("🚀 STARTING TWO-STAGE DART SCRAPER")
         logger.info(f"📍 Event URL: {event_url}")
         logger.info("=" * 80)
         
@@ -431,7 +432,7 @@ class TwoStageDartScraper:
                     time.sleep(self.delay)
             
             # Extract tournament bracket
-            logger.info(f"🏆 STAGE 3: Tournament Bracket Extraction")
+            logger.info("🏆 STAGE 3: Tournament Bracket Extraction")
             bracket_results = self.extract_tournament_bracket(event_url)
             
             # Create DataFrame
@@ -441,7 +442,7 @@ class TwoStageDartScraper:
                 # Add tournament results as metadata
                 df.attrs['tournament_results'] = bracket_results
                 
-                logger.info(f"✅ SUCCESS!")
+                logger.info("✅ SUCCESS!")
                 logger.info(f"📊 Matches processed: {successful}/{len(match_urls)}")
                 logger.info(f"👥 Total player records: {len(all_player_data)}")
                 logger.info(f"🏆 Champion: {bracket_results.get('champion', 'Unknown')}")
@@ -490,8 +491,8 @@ class TwoStageDartScraper:
             return False
 
 
-def main():
-    """Main function demonstrating the scraper usage"""
+def main_two_stage():
+    """Run TwoStageDartScraper on the example event"""
     
     # Example usage
     event_url = "https://tv.dartconnect.com/event/mt_joe6163l_1"
@@ -519,47 +520,27 @@ def main():
         # Save to CSV
         scraper.save_to_csv(df, "dart_stats.csv")
         
-        print(f"\n✅ Complete! Results saved to 'dart_stats.csv'")
+        print("\n✅ Complete! Results saved to 'dart_stats.csv'")
         
     else:
         print("❌ No data scraped")
 
 
-if __name__ == "__main__":
-    main()
-"""
-
-import requests
-from bs4 import BeautifulSoup
-import pandas as pd
-import time
-import re
-import json
-from typing import List, Dict, Optional, Tuple
-from urllib.parse import urljoin, urlparse
-import logging
-from datetime import datetime
+# ---------------------------------------------------------------------------
+# Event page scraper (DartEventScraper). main() below is the script entry
+# point; main_two_stage() above runs TwoStageDartScraper instead.
+# ---------------------------------------------------------------------------
 
 # Selenium imports (will install if needed)
 try:
     from selenium import webdriver
-    from selenium.webdriver.common.by import By
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, NoSuchElementException
     SELENIUM_AVAILABLE = True
 except ImportError:
     SELENIUM_AVAILABLE = False
     print("⚠️  Selenium not available. Install with: pip install selenium")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 
 class DartEventScraper:
     """
@@ -586,7 +567,6 @@ class DartEventScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive'
         })
         
@@ -840,7 +820,7 @@ class DartEventScraper:
                     all_match_data.extend(match_data)
                     logger.info(f"  ✅ Extracted {len(match_data)} players")
                 else:
-                    logger.warning(f"  ❌ No data extracted")
+                    logger.warning("  ❌ No data extracted")
                 
             except Exception as e:
                 logger.error(f"  ❌ Error processing {url}: {e}")
@@ -1014,9 +994,6 @@ class DartEventScraper:
         """Parse player data from a generic container."""
         # Template for generic parsing - customize as needed
         try:
-            # Extract text and look for patterns
-            text = container.get_text().strip()
-            
             # Basic template - adapt for specific sites
             player_data = {
                 'match_url': url,
@@ -1182,7 +1159,7 @@ class DartEventScraper:
         print(f"🎮 Total Matches: {df['match_url'].nunique()}")
         
         if not df.empty:
-            print(f"\n🏆 Top Performers by 3-Dart Average:")
+            print("\n🏆 Top Performers by 3-Dart Average:")
             top_players = df.groupby('player_name').agg({
                 '3da': 'mean',
                 'count_180': 'sum',
@@ -1194,7 +1171,7 @@ class DartEventScraper:
                 print(f"  • {player}: {stats['3da']:.2f} avg, {stats['count_180']} x 180s")
         
         if bracket_info.get('champion'):
-            print(f"\n🏆 Tournament Results:")
+            print("\n🏆 Tournament Results:")
             print(f"  Champion: {bracket_info['champion']}")
             print(f"  Runner-up: {bracket_info['runner_up']}")
         